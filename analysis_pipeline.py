@@ -0,0 +1,204 @@
+"""asyncio pipeline over the component analysis stages.
+
+Components flow in micro-batches through requirement analysis, compliance
+assessment, risk assessment and recommendation generation. Stages are joined
+by bounded queues, so a slow consumer fills the queues and the feeder stops
+pulling from the source; the CPU-bound work of each stage runs in an executor
+so the event loop stays responsive. Results come out in input order.
+
+    pipeline = AnalysisPipeline(batch_size=32, queue_size=4)
+    async for result in pipeline.run(components):
+        ...
+        print(pipeline.queue_depths())
+"""
+import asyncio
+import time
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import AsyncIterable, AsyncIterator, Dict, Iterable, List, Optional, Union
+
+from app2 import AnalysisTier, GenAIAnalysisModule
+
+
+async def _aiter(components: Union[Iterable[Dict], AsyncIterable[Dict]]) -> AsyncIterator[Dict]:
+    if hasattr(components, "__aiter__"):
+        async for component in components:
+            yield component
+    else:
+        for component in components:
+            yield component
+
+
+class _EndOfStream:
+    """Queue marker passed down the stages when the input is exhausted or a stage fails"""
+
+    def __init__(self, error: Optional[BaseException] = None):
+        self.error = error
+
+
+class StageStats:
+    def __init__(self):
+        self.batches = 0
+        self.items = 0
+        self.busy_seconds = 0.0
+        self.max_depth = 0
+
+    def to_dict(self) -> Dict:
+        return {
+            "batches": self.batches,
+            "items": self.items,
+            "busy_seconds": round(self.busy_seconds, 4),
+            "max_depth": self.max_depth
+        }
+
+
+class AnalysisPipeline:
+    """Runs GenAIAnalysisModule's stages concurrently over a stream of components
+
+    Each stage has one worker, which keeps results in input order. queue_size bounds the
+    number of batches waiting in front of each stage and in front of the consumer.
+    """
+
+    STAGES = ("requirements", "compliance", "risk", "recommendations")
+
+    def __init__(self, module: Optional[GenAIAnalysisModule] = None, tier: AnalysisTier = AnalysisTier.FULL,
+                 batch_size: int = 32, queue_size: int = 4, executor: Optional[Executor] = None):
+        self.module = module or GenAIAnalysisModule()
+        self.tier = tier
+        self.batch_size = batch_size
+        self.queue_size = queue_size
+        self.executor = executor
+        self.stage_stats = {name: StageStats() for name in self.STAGES + ("output",)}
+        self._queues = {}
+
+    def queue_depths(self) -> Dict[str, int]:
+        """Batches currently waiting in front of each stage ("output" is waiting for the consumer)"""
+        return {name: q.qsize() for name, q in self._queues.items()}
+
+    def stats(self) -> Dict:
+        depths = self.queue_depths()
+        return {
+            name: {**stats.to_dict(), "depth": depths.get(name, 0)}
+            for name, stats in self.stage_stats.items()
+        }
+
+    async def run(self, components: Union[Iterable[Dict], AsyncIterable[Dict]]) -> AsyncIterator[Dict]:
+        """Yield one analysis result per component, in the same shape as analyze_component
+
+        Component dicts are updated in place with their detected domain, layer and entities.
+        """
+        loop = asyncio.get_running_loop()
+        executor = self.executor or ThreadPoolExecutor(max_workers=len(self.STAGES),
+                                                       thread_name_prefix="analysis-stage")
+        names = self.STAGES + ("output",)
+        self._queues = {name: asyncio.Queue(self.queue_size) for name in names}
+        self.stage_stats = {name: StageStats() for name in names}
+
+        tasks = [asyncio.create_task(self._feed(components, self._queues[names[0]]))]
+        for name, next_name in zip(self.STAGES, names[1:]):
+            tasks.append(asyncio.create_task(self._stage(
+                loop, executor, name, next_name, self._queues[name], self._queues[next_name]
+            )))
+
+        try:
+            output = self._queues["output"]
+            while True:
+                batch = await output.get()
+                if isinstance(batch, _EndOfStream):
+                    if batch.error is not None:
+                        raise batch.error
+                    break
+                for result in batch:
+                    yield result
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            if self.executor is None:
+                executor.shutdown(wait=False)
+
+    async def _put(self, name: str, queue: asyncio.Queue, batch):
+        # Blocks while the queue is full, which is what pushes back on upstream stages
+        await queue.put(batch)
+        stats = self.stage_stats[name]
+        stats.max_depth = max(stats.max_depth, queue.qsize())
+
+    async def _feed(self, components, outbox: asyncio.Queue):
+        first = self.STAGES[0]
+        batch = []
+        try:
+            async for component in _aiter(components):
+                batch.append(component)
+                if len(batch) == self.batch_size:
+                    await self._put(first, outbox, batch)
+                    batch = []
+            if batch:
+                await self._put(first, outbox, batch)
+        except Exception as e:
+            await outbox.put(_EndOfStream(e))
+            return
+        await outbox.put(_EndOfStream())
+
+    async def _stage(self, loop, executor: Executor, name: str, downstream: str, inbox: asyncio.Queue,
+                     outbox: asyncio.Queue):
+        fn = getattr(self, f"_{name}")
+        stats = self.stage_stats[name]
+        while True:
+            batch = await inbox.get()
+            if isinstance(batch, _EndOfStream):
+                await outbox.put(batch)
+                return
+            start = time.perf_counter()
+            try:
+                batch = await loop.run_in_executor(executor, fn, batch)
+            except Exception as e:
+                await outbox.put(_EndOfStream(e))
+                return
+            stats.busy_seconds += time.perf_counter() - start
+            stats.batches += 1
+            stats.items += len(batch)
+            await self._put(downstream, outbox, batch)
+
+    # Stage functions run in the executor; each takes and returns a list of partial results
+
+    def _requirements(self, components: List[Dict]) -> List[Dict]:
+        results = [{"component": component, "requirement_analysis": None} for component in components]
+        described = [r for r in results if r["component"].get("description")]
+        analyses = self.module.requirement_analyzer.analyze_requirements_batch(
+            [r["component"]["description"] for r in described], batch_size=self.batch_size, tier=self.tier
+        )
+        for result, req_analysis in zip(described, analyses):
+            result["requirement_analysis"] = req_analysis
+            result["component"].update({
+                "domain": req_analysis["primary_domain"],
+                "layer": req_analysis["primary_layer"],
+                "entities": req_analysis["entities"]
+            })
+        return results
+
+    def _compliance(self, results: List[Dict]) -> List[Dict]:
+        assessor = self.module.architecture_assessor
+        for result in results:
+            result["architecture_assessment"] = assessor.assess_compliance(result["component"])
+        return results
+
+    def _risk(self, results: List[Dict]) -> List[Dict]:
+        assessor = self.module.risk_assessor
+        for result in results:
+            result["risk_assessment"] = assessor.assess_risk(result["component"])
+        return results
+
+    def _recommendations(self, results: List[Dict]) -> List[Dict]:
+        module = self.module
+        for result in results:
+            result["recommendations"] = (
+                module.architecture_assessor.generate_recommendations(result["architecture_assessment"]) +
+                module.risk_assessor.generate_risk_mitigation(result["risk_assessment"])
+            )
+        return results
+
+
+def run_pipeline(components: Iterable[Dict], **kwargs) -> List[Dict]:
+    """Run an AnalysisPipeline to completion from synchronous code"""
+    async def collect():
+        return [result async for result in AnalysisPipeline(**kwargs).run(components)]
+    return asyncio.run(collect())
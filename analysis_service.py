@@ -0,0 +1,281 @@
+"""Local HTTP service around GenAIAnalysisModule.
+
+Keeps the spaCy model and catalogs loaded between requests and coalesces
+concurrent requests into one batched analysis (a single nlp.pipe call) once
+either the batch is full or the oldest request has waited out the latency
+budget. Uses only the standard library server, so it runs offline on localhost.
+
+    python analysis_service.py --port 8765 --max-delay-ms 5
+
+    POST /analyze[?tier=fast]  one component object, or a list of them
+    GET  /stats                request, batch and latency counters
+    GET  /metrics              per-stage timings as Prometheus text (JSON with ?format=json)
+    GET  /health
+"""
+import argparse
+import json
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
+
+from app2 import METRICS, AnalysisTier, GenAIAnalysisModule, StreamingHistogram, normalize_component, to_jsonable
+
+
+class RequestCoalescer:
+    """Collects components submitted from many threads and analyzes them in batches on one worker thread
+
+    Latencies are tracked in milliseconds with 0.1ms resolution; anything above one second
+    lands in the top bin.
+    """
+
+    def __init__(self, module: Optional[GenAIAnalysisModule] = None, max_batch: int = 64,
+                 max_delay: float = 0.005):
+        self.module = module or GenAIAnalysisModule()
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread = None
+        self.started_at = time.monotonic()
+        self.requests = 0
+        self.batches = 0
+        self.errors = 0
+        self.max_batch_seen = 0
+        self.latency_ms = StreamingHistogram(0.0, 1000.0, 10000)
+        self.queue_wait_ms = StreamingHistogram(0.0, 1000.0, 10000)
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="analysis-batcher", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join()
+            self._thread = None
+
+    def warm_up(self, tiers=(AnalysisTier.FULL,)):
+        """Load the model and compiled tables before the first real request"""
+        for tier in tiers:
+            self.module.analyze_components([{"description": "warm up"}], tier, record=False)
+
+    def submit(self, component: Dict, tier: AnalysisTier = AnalysisTier.FULL) -> Future:
+        future = Future()
+        self._queue.put((component, tier, future, time.perf_counter()))
+        return future
+
+    def analyze(self, component: Dict, tier: AnalysisTier = AnalysisTier.FULL,
+                timeout: Optional[float] = None) -> Dict:
+        return self.submit(component, tier).result(timeout)
+
+    def _collect(self, first) -> List:
+        batch = [first]
+        # The budget runs from when the first request was submitted, not from when the worker got to it
+        deadline = first[3] + self.max_delay
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.perf_counter()
+            try:
+                item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is None:
+                # Re-queue the stop sentinel so the loop exits after this batch
+                self._queue.put(None)
+                break
+            batch.append(item)
+        return batch
+
+    def _run(self):
+        while True:
+            first = self._queue.get()
+            if first is None:
+                return
+            batch = self._collect(first)
+            started = time.perf_counter()
+
+            by_tier = {}
+            for item in batch:
+                by_tier.setdefault(item[1], []).append(item)
+            for tier, items in by_tier.items():
+                try:
+                    results = self.module.analyze_components([item[0] for item in items], tier, record=False)
+                except Exception:
+                    self._analyze_each(items, tier)
+                    continue
+                for item, result in zip(items, results):
+                    item[2].set_result(result)
+
+            finished = time.perf_counter()
+            with self._lock:
+                self.requests += len(batch)
+                self.batches += 1
+                self.max_batch_seen = max(self.max_batch_seen, len(batch))
+                self.latency_ms.add([(finished - item[3]) * 1000 for item in batch])
+                self.queue_wait_ms.add([(started - item[3]) * 1000 for item in batch])
+
+    def _analyze_each(self, items: List, tier: AnalysisTier):
+        """Retry a failed batch one request at a time so only the failing requests see the error"""
+        for component, _, future, _ in items:
+            try:
+                future.set_result(self.module.analyze_components([component], tier, record=False)[0])
+            except Exception as e:
+                with self._lock:
+                    self.errors += 1
+                future.set_exception(e)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            uptime = time.monotonic() - self.started_at
+            return {
+                "uptime_s": round(uptime, 3),
+                "requests": self.requests,
+                "batches": self.batches,
+                "errors": self.errors,
+                "queued": self._queue.qsize(),
+                "mean_batch_size": round(self.requests / self.batches, 2) if self.batches else None,
+                "max_batch_size": self.max_batch_seen,
+                "requests_per_sec": round(self.requests / uptime, 1) if uptime else None,
+                "latency_ms": _latency_summary(self.latency_ms),
+                "queue_wait_ms": _latency_summary(self.queue_wait_ms)
+            }
+
+
+def _latency_summary(hist: StreamingHistogram) -> Dict:
+    summary = {"mean": hist.mean()}
+    summary.update({f"p{int(q * 100)}": hist.quantile(q) for q in (0.5, 0.95, 0.99)})
+    return {k: round(v, 3) if v is not None else None for k, v in summary.items()}
+
+
+class AnalysisRequestHandler(BaseHTTPRequestHandler):
+    server_version = "EAAnalysis/1.0"
+
+    def do_GET(self):
+        path = urlparse(self.path).path
+        if path == "/health":
+            self._send_json(200, {"status": "ok", "version": self.server.coalescer.module.version})
+        elif path == "/stats":
+            self._send_json(200, self.server.coalescer.stats())
+        elif path == "/metrics":
+            metrics = self.server.coalescer.module.metrics
+            if parse_qs(urlparse(self.path).query).get("format") == ["json"]:
+                self._send_json(200, metrics.to_dict())
+            else:
+                self._send(200, metrics.to_prometheus().encode("utf-8"), "text/plain; version=0.0.4")
+        else:
+            self._send_json(404, {"error": f"unknown path {path}"})
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        if url.path != "/analyze":
+            self._send_json(404, {"error": f"unknown path {url.path}"})
+            return
+
+        tier_name = parse_qs(url.query).get("tier", ["full"])[0].upper()
+        if tier_name not in AnalysisTier.__members__:
+            self._send_json(400, {"error": f"unknown tier {tier_name.lower()}"})
+            return
+
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            payload = json.loads(self.rfile.read(length) or b"null")
+        except ValueError as e:
+            self._send_json(400, {"error": f"invalid JSON body: {e}"})
+            return
+        components = payload if isinstance(payload, list) else [payload]
+        if not components or not all(isinstance(c, dict) for c in components):
+            self._send_json(400, {"error": "expected a component object or a list of them"})
+            return
+        try:
+            for component in components:
+                normalize_component(component)
+        except ValueError as e:
+            self._send_json(400, {"error": str(e)})
+            return
+
+        coalescer = self.server.coalescer
+        futures = [coalescer.submit(c, AnalysisTier[tier_name]) for c in components]
+        try:
+            results = [to_jsonable(f.result(self.server.request_timeout)) for f in futures]
+        except Exception as e:
+            self._send_json(500, {"error": str(e)})
+            return
+        self._send_json(200, results if isinstance(payload, list) else results[0])
+
+    def _send_json(self, status: int, body):
+        self._send(status, json.dumps(body).encode("utf-8"), "application/json")
+
+    def _send(self, status: int, data: bytes, content_type: str):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+class AnalysisServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # The socketserver default backlog of 5 drops connections under concurrent load
+    request_queue_size = 128
+
+    def __init__(self, address, coalescer: RequestCoalescer, request_timeout: float = 30.0,
+                 verbose: bool = False):
+        super().__init__(address, AnalysisRequestHandler)
+        self.coalescer = coalescer
+        self.request_timeout = request_timeout
+        self.verbose = verbose
+
+    def server_close(self):
+        super().server_close()
+        self.coalescer.stop()
+
+
+def make_server(host: str = "127.0.0.1", port: int = 8765, module: Optional[GenAIAnalysisModule] = None,
+                max_batch: int = 64, max_delay: float = 0.005, **kwargs) -> AnalysisServer:
+    """Build a server with a started batcher; port 0 picks a free port (see server.server_address)"""
+    coalescer = RequestCoalescer(module, max_batch=max_batch, max_delay=max_delay).start()
+    return AnalysisServer((host, port), coalescer, **kwargs)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve component analysis over HTTP")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--max-batch", type=int, default=64, help="largest batch sent to the analyzer")
+    parser.add_argument("--max-delay-ms", type=float, default=5.0,
+                        help="how long the first request in a batch may wait for others")
+    parser.add_argument("--deterministic", action="store_true", help="derive scores from component content")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--no-warm-up", action="store_true", help="load the model on the first request instead")
+    parser.add_argument("--verbose", action="store_true", help="log every request")
+    parser.add_argument("--metrics", action="store_true", help="record per-stage timings for /metrics")
+    args = parser.parse_args(argv)
+    METRICS.enabled = METRICS.enabled or args.metrics
+
+    module = GenAIAnalysisModule(deterministic=args.deterministic, seed=args.seed)
+    server = make_server(args.host, args.port, module, max_batch=args.max_batch,
+                         max_delay=args.max_delay_ms / 1000, verbose=args.verbose)
+    if not args.no_warm_up:
+        server.coalescer.warm_up()
+
+    host, port = server.server_address[:2]
+    print(f"Serving analysis on http://{host}:{port}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,19 +1,74 @@
 import os
-import streamlit as st
+import importlib
 import pandas as pd
 import numpy as np
-from typing import Dict, List
+import threading
+import time
+import bisect
+import hashlib
+import io
+import re
+import string
+import zlib
+import functools
+import sqlite3
+import pickle
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from types import MappingProxyType
+from typing import Dict, Iterable, Iterator, List, Mapping, Optional, Set, Tuple, Union
 import json
 from enum import Enum
 
 
-# Load NLP model
-try:
-    nlp = spacy.load("en_core_web_sm")  
-except:
-    st.warning("SpaCy model not found. Installing...")
-    os.system("python -m spacy download en_core_web_sm")
-    nlp = spacy.load("en_core_web_sm")
+class _LazyModule:
+    """Defer importing a heavy module until one of its attributes is first used"""
+
+    def __init__(self, name: str):
+        self._name = name
+
+    def __getattr__(self, attr):
+        return getattr(importlib.import_module(self._name), attr)
+
+
+# The UI and NLP stacks are only imported when used, so headless batch and service
+# entry points can import this module without pulling in Streamlit or matplotlib
+st = _LazyModule("streamlit")
+plt = _LazyModule("matplotlib.pyplot")
+spacy = _LazyModule("spacy")
+
+
+# NLP model, loaded lazily once per process
+NLP_MODEL = "en_core_web_sm"
+# NER in the small English model has its own internal tok2vec; the shared one only feeds tagger and parser
+NER_PIPE = "ner"
+UNUSED_PIPES = ["tok2vec", "tagger", "parser", "attribute_ruler", "lemmatizer", "senter"]
+
+_nlp = None
+_nlp_lock = threading.Lock()
+
+
+def get_nlp():
+    """Return the shared spaCy pipeline, loaded with only the tokenizer and NER"""
+    global _nlp
+    if _nlp is not None:
+        return _nlp
+
+    with _nlp_lock:
+        if _nlp is None:
+            try:
+                nlp = spacy.load(NLP_MODEL, exclude=UNUSED_PIPES)
+            except OSError as e:
+                raise OSError(
+                    f"spaCy model '{NLP_MODEL}' is not installed. "
+                    f"Install it with: python -m spacy download {NLP_MODEL}"
+                ) from e
+            # Other model versions may ship pipes not listed above; keep nothing but NER running
+            for name in nlp.pipe_names:
+                if name != NER_PIPE:
+                    nlp.disable_pipe(name)
+            _nlp = nlp
+    return _nlp
 
 
 class ArchitectureDomain(Enum):
@@ -39,137 +94,825 @@ class RiskLevel(Enum):
     CRITICAL = "Critical"
 
 
+@functools.lru_cache(maxsize=None)
+def enum_lookup(enum_cls) -> Dict:
+    """Map each member of enum_cls, and its name and value, to its code in enum definition order"""
+    lookup = {}
+    for code, member in enumerate(enum_cls):
+        lookup.update({member: code, member.name: code, member.value: code})
+    return lookup
+
+
+def enum_codes(df: pd.DataFrame, column: str, enum_cls, default: Enum) -> np.ndarray:
+    """Map a column of enum members, names or values to integer codes in enum definition order"""
+    members = list(enum_cls)
+    if column not in df:
+        return np.full(len(df), members.index(default), dtype=np.intp)
+    return df[column].map(enum_lookup(enum_cls)).fillna(members.index(default)).to_numpy(dtype=np.intp)
+
+
+COMPONENT_ENUM_FIELDS = {"domain": ArchitectureDomain, "layer": NORALayer}
+
+
+def normalize_component(component: Dict) -> Dict:
+    """Convert domain and layer given as enum names or values to members, in place
+
+    None counts as not provided. Raises ValueError for anything that is not a known member,
+    and for a description that is not a string.
+    """
+    description = component.get("description")
+    if description is not None and not isinstance(description, str):
+        raise ValueError(f"description must be a string, got {type(description).__name__}")
+    for field, enum_cls in COMPONENT_ENUM_FIELDS.items():
+        value = component.get(field)
+        if value is None:
+            component.pop(field, None)
+            continue
+        try:
+            code = enum_lookup(enum_cls).get(value)
+        except TypeError:
+            code = None
+        if code is None:
+            raise ValueError(f"unknown {field} {value!r}; expected one of {[m.name for m in enum_cls]}")
+        component[field] = list(enum_cls)[code]
+    return component
+
+
+def _optional_column(df: pd.DataFrame, column: str) -> List:
+    """Column values as a list with missing entries as None, or all None if the column is absent"""
+    if column not in df:
+        return [None] * len(df)
+    return [None if pd.isna(v) else v for v in df[column]]
+
+
+class AnalysisTier(Enum):
+    FAST = "fast"  # keyword scoring only, no spaCy pass and no entities
+    FULL = "full"  # adds the statistical NER pipeline
+
+
+# Requirement analysis cache. The SQLite store is opt-in: set EA_ANALYSIS_CACHE to a file path
+# to keep analyses across runs, and EA_ANALYSIS_CACHE_MAX_ENTRIES to bound it (default 100000).
+ANALYSIS_CACHE_PATH = os.environ.get("EA_ANALYSIS_CACHE") or None
+ANALYSIS_CACHE_MAX_DISK_ENTRIES = int(os.environ.get("EA_ANALYSIS_CACHE_MAX_ENTRIES", 100000))
+
+_analysis_cache = None
+_analysis_cache_lock = threading.Lock()
+
+
+def _encode_analysis(result: Dict) -> str:
+    return json.dumps({
+        "primary_domain": result["primary_domain"].name,
+        "domain_scores": {d.name: s for d, s in result["domain_scores"].items()},
+        "primary_layer": result["primary_layer"].name,
+        "layer_scores": {l.name: s for l, s in result["layer_scores"].items()},
+        "entities": result["entities"]
+    })
+
+
+def _decode_analysis(payload: str) -> Dict:
+    data = json.loads(payload)
+    return {
+        "primary_domain": ArchitectureDomain[data["primary_domain"]],
+        "domain_scores": {ArchitectureDomain[d]: s for d, s in data["domain_scores"].items()},
+        "primary_layer": NORALayer[data["primary_layer"]],
+        "layer_scores": {NORALayer[l]: s for l, s in data["layer_scores"].items()},
+        "entities": [tuple(ent) for ent in data["entities"]]
+    }
+
+
+def _copy_analysis(result: Dict) -> Dict:
+    return {
+        **result,
+        "domain_scores": dict(result["domain_scores"]),
+        "layer_scores": dict(result["layer_scores"]),
+        "entities": list(result["entities"])
+    }
+
+
+class AnalysisCache:
+    """Content-addressed requirement analysis cache: a bounded in-memory LRU over an optional SQLite store
+
+    The store keeps at most max_disk_entries rows, dropping the oldest-written ones first.
+    """
+
+    def __init__(self, path: Optional[str] = ANALYSIS_CACHE_PATH, max_entries: int = 4096,
+                 max_disk_entries: int = ANALYSIS_CACHE_MAX_DISK_ENTRIES):
+        self.path = path
+        self.max_entries = max_entries
+        self.max_disk_entries = max_disk_entries
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        if path:
+            # Portfolio workers share the file, so wait on their write locks rather than fail
+            self._db = sqlite3.connect(path, check_same_thread=False, timeout=30)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("CREATE TABLE IF NOT EXISTS analysis (key TEXT PRIMARY KEY, result TEXT NOT NULL)")
+            self._db.commit()
+            self._disk_entries = self._db.execute("SELECT COUNT(*) FROM analysis").fetchone()[0]
+
+    @staticmethod
+    def make_key(text: str, version: str) -> str:
+        normalized = " ".join(text.lower().split())
+        return hashlib.sha256(f"{version}\0{normalized}".encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict]:
+        with self._lock:
+            result = self._memory.get(key)
+            if result is not None:
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+                return _copy_analysis(result)
+
+            row = None
+            if self._db is not None:
+                row = self._db.execute("SELECT result FROM analysis WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+
+            self.disk_hits += 1
+            result = _decode_analysis(row[0])
+            self._remember(key, result)
+            return _copy_analysis(result)
+
+    def put(self, key: str, result: Dict):
+        self.put_many([(key, result)])
+
+    def put_many(self, items: List):
+        with self._lock:
+            for key, result in items:
+                self._remember(key, _copy_analysis(result))
+            if self._db is not None and items:
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO analysis (key, result) VALUES (?, ?)",
+                    [(key, _encode_analysis(result)) for key, result in items]
+                )
+                # Replacements also count here, so this only overestimates; recount before evicting
+                self._disk_entries += len(items)
+                if self._disk_entries > self.max_disk_entries:
+                    self._evict()
+                self._db.commit()
+
+    def _evict(self):
+        # REPLACE assigns a fresh rowid, so the lowest rowids are the oldest writes
+        self._disk_entries = self._db.execute("SELECT COUNT(*) FROM analysis").fetchone()[0]
+        excess = self._disk_entries - self.max_disk_entries
+        if excess > 0:
+            self._db.execute(
+                "DELETE FROM analysis WHERE rowid IN (SELECT rowid FROM analysis ORDER BY rowid LIMIT ?)", (excess,)
+            )
+            self._disk_entries -= excess
+
+    def _remember(self, key: str, result: Dict):
+        self._memory[key] = result
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM analysis")
+                self._db.commit()
+                self._disk_entries = 0
+
+    def stats(self) -> Dict:
+        hits = self.memory_hits + self.disk_hits
+        lookups = hits + self.misses
+        return {
+            "hits": hits,
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": hits / lookups if lookups else 0.0,
+            "memory_entries": len(self._memory)
+        }
+
+
+def get_analysis_cache() -> AnalysisCache:
+    """Return the process-wide requirement analysis cache"""
+    global _analysis_cache
+    with _analysis_cache_lock:
+        if _analysis_cache is None:
+            _analysis_cache = AnalysisCache()
+    return _analysis_cache
+
+
+class _NullTimer:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class _StageTimer:
+    __slots__ = ("metrics", "stage", "start")
+
+    def __init__(self, metrics: "StageMetrics", stage: str):
+        self.metrics = metrics
+        self.stage = stage
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.metrics.observe(self.stage, time.perf_counter() - self.start, error=exc_type is not None)
+        return False
+
+
+class StageMetrics:
+    """Per-stage call counters and latency histograms, exportable as Prometheus text or JSON
+
+    Disabled by default (or enabled with EA_METRICS=1); while disabled, time() hands back a
+    shared no-op context manager, so instrumented code pays for little more than the with.
+    """
+
+    # Histogram bucket upper bounds in seconds
+    BUCKETS = (0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0,
+               2.5, 5.0)
+
+    def __init__(self, enabled: bool = False, prefix: str = "ea_analysis"):
+        self.enabled = enabled
+        self.prefix = prefix
+        self._lock = threading.Lock()
+        self._stages = {}
+
+    def time(self, stage: str):
+        return _StageTimer(self, stage) if self.enabled else _NULL_TIMER
+
+    def observe(self, stage: str, seconds: float, error: bool = False):
+        bucket = bisect.bisect_left(self.BUCKETS, seconds)
+        with self._lock:
+            entry = self._stages.get(stage)
+            if entry is None:
+                entry = self._stages[stage] = {"count": 0, "errors": 0, "sum": 0.0,
+                                               "buckets": [0] * (len(self.BUCKETS) + 1)}
+            entry["count"] += 1
+            entry["errors"] += error
+            entry["sum"] += seconds
+            entry["buckets"][bucket] += 1
+
+    def reset(self):
+        with self._lock:
+            self._stages.clear()
+
+    def to_dict(self) -> Dict:
+        with self._lock:
+            stages = {name: {**entry, "buckets": list(entry["buckets"])} for name, entry in self._stages.items()}
+        result = {}
+        for name, entry in sorted(stages.items()):
+            cumulative = np.cumsum(entry["buckets"]).tolist()
+            result[name] = {
+                "count": entry["count"],
+                "errors": entry["errors"],
+                "sum_seconds": entry["sum"],
+                "mean_ms": entry["sum"] / entry["count"] * 1000 if entry["count"] else None,
+                "buckets": dict(zip([str(b) for b in self.BUCKETS] + ["+Inf"], cumulative))
+            }
+        return result
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict(), indent=2)
+
+    def to_prometheus(self) -> str:
+        stages = self.to_dict()
+        name = f"{self.prefix}_stage_duration_seconds"
+        lines = [
+            f"# HELP {name} Time spent in each analysis stage.",
+            f"# TYPE {name} histogram"
+        ]
+        for stage, entry in stages.items():
+            for le, count in entry["buckets"].items():
+                lines.append(f'{name}_bucket{{stage="{stage}",le="{le}"}} {count}')
+            lines.append(f'{name}_sum{{stage="{stage}"}} {entry["sum_seconds"]!r}')
+            lines.append(f'{name}_count{{stage="{stage}"}} {entry["count"]}')
+
+        errors = f"{self.prefix}_stage_errors_total"
+        lines += [f"# HELP {errors} Stage calls that raised.", f"# TYPE {errors} counter"]
+        lines += [f'{errors}{{stage="{stage}"}} {entry["errors"]}' for stage, entry in stages.items()]
+        return "\n".join(lines) + "\n"
+
+    def dump(self, path: str, fmt: Optional[str] = None):
+        """Write the metrics to path, as JSON for .json files and Prometheus text otherwise"""
+        fmt = fmt or ("json" if path.endswith(".json") else "prometheus")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(self.to_json() if fmt == "json" else self.to_prometheus())
+
+
+METRICS = StageMetrics(enabled=os.environ.get("EA_METRICS", "") not in ("", "0"))
+
+
+def _iter_text_chunks(source: Union[str, Iterable[str]], max_chars: int) -> Iterator[str]:
+    """Split a document into paragraph chunks of at most max_chars
+
+    Long paragraphs are cut at sentence ends, else at the last whitespace, else at max_chars.
+    A multi-word keyword straddling a whitespace cut is counted as its separate words.
+    """
+    lines = io.StringIO(source) if isinstance(source, str) else source
+    buffer, size = [], 0
+
+    for line in lines:
+        if not line.strip():
+            if buffer:
+                yield "".join(buffer)
+                buffer, size = [], 0
+            continue
+
+        while len(line) > max_chars:
+            if buffer:
+                yield "".join(buffer)
+                buffer, size = [], 0
+            cut = line.rfind(". ", 0, max_chars) + 1
+            if not cut:
+                # No sentence end: break at the last whitespace before the limit so words are not split
+                cut = max(line.rfind(" ", 1, max_chars), line.rfind("\t", 1, max_chars))
+                if cut <= 0:
+                    cut = max_chars
+            yield line[:cut]
+            line = line[cut:]
+
+        if buffer and size + len(line) > max_chars:
+            yield "".join(buffer)
+            buffer, size = [], 0
+        buffer.append(line)
+        size += len(line)
+
+    if buffer:
+        yield "".join(buffer)
+
+
+class KeywordAutomaton:
+    """Word-level phrase trie that finds single- and multi-word keywords in one scan of lowercased text
+
+    Matching is leftmost-longest: a matched phrase consumes its words, so "data center
+    migration" yields only "data center", not also "data" and "center".
+    """
+
+    WORD_PATTERN = re.compile(r"\w+")
+    MATCHING = "leftmost-longest"
+
+    def __init__(self, phrases: List[str]):
+        self._root = {}
+        for phrase_id, phrase in enumerate(phrases):
+            node = self._root
+            for word in self.WORD_PATTERN.findall(phrase.lower()):
+                node = node.setdefault(word, {})
+            node[""] = phrase_id
+
+    def find(self, text: str) -> List[int]:
+        """Return the ids of the non-overlapping phrases in text, in order of occurrence"""
+        return self.find_words(self.WORD_PATTERN.findall(text))
+
+    def find_words(self, words: List[str]) -> List[int]:
+        """find() over text already split with WORD_PATTERN, so several automata can share one split"""
+        root = self._root
+        ids = []
+        start = 0
+        while start < len(words):
+            node = root.get(words[start])
+            end = start + 1
+            match = None
+            while node is not None:
+                if "" in node:
+                    match = (node[""], end)
+                if end == len(words):
+                    break
+                node = node.get(words[end])
+                end += 1
+            if match is None:
+                start += 1
+            else:
+                ids.append(match[0])
+                start = match[1]
+        return ids
+
+
+@functools.lru_cache(maxsize=65536)
+def _hashed_word_features(word: str, n_features: int) -> Tuple[int, ...]:
+    padded = f" {word} "
+    grams = [f"w:{word}"] + [padded[i:i + n] for n in (3, 4) for i in range(len(padded) - n + 1)]
+    return tuple(zlib.crc32(gram.encode("utf-8")) % n_features for gram in grams)
+
+
+class CentroidClassifier:
+    """CPU-only classifier comparing hashed TF-IDF vectors (words + character n-grams) to class centroids
+
+    Character n-grams let inflected or compound words such as "databases" or "microservices"
+    score against their keyword class where exact keyword matching finds nothing. The same
+    n-grams give every text a small similarity to every class, so scores never reach zero;
+    RequirementAnalyzer treats anything below VECTOR_MIN_SIMILARITY as no signal.
+    """
+
+    def __init__(self, seed_docs: List[str], n_features: int = 2 ** 12):
+        self.n_features = n_features
+        seed_counts = self.vectorize(seed_docs)
+        df = np.count_nonzero(seed_counts, axis=0)
+        self.idf = np.log((1 + len(seed_docs)) / (1 + df)) + 1
+        self.centroids = self._normalize(np.log1p(seed_counts) * self.idf).T
+
+    def vectorize(self, texts: List[str]) -> np.ndarray:
+        """Return the docs x n_features hashed term-count matrix"""
+        flat = []
+        for row, text in enumerate(texts):
+            base = row * self.n_features
+            for word in KeywordAutomaton.WORD_PATTERN.findall(text):
+                flat.extend(base + f for f in _hashed_word_features(word, self.n_features))
+        counts = np.bincount(flat, minlength=len(texts) * self.n_features)
+        return counts.reshape(len(texts), self.n_features).astype(np.float64)
+
+    def score_counts(self, counts: np.ndarray) -> np.ndarray:
+        """Return the cosine similarity of each count row to every class centroid"""
+        return self._normalize(np.log1p(counts) * self.idf) @ self.centroids
+
+    @staticmethod
+    def _normalize(x: np.ndarray) -> np.ndarray:
+        norms = np.linalg.norm(x, axis=1, keepdims=True)
+        return x / np.where(norms == 0, 1, norms)
+
+
+# Compiled keyword tables by keyword_version, shared between analyzers
+_keyword_index_cache = {}
+_keyword_index_lock = threading.Lock()
+
+
 class RequirementAnalyzer:
-    def __init__(self):
+    SCORE_BLOCK = 1024
+    # With use_vectors, a text whose best domain (or layer) similarity is below this is
+    # too far from every class to call; that block falls back to keyword scores instead.
+    # Unrelated text scores around 0.02-0.07 through shared character n-grams alone.
+    VECTOR_MIN_SIMILARITY = 0.08
+
+    def __init__(self, cache: Optional[AnalysisCache] = None, use_vectors: bool = False):
+        self.cache = cache
+        self.use_vectors = use_vectors
+
         self.domain_keywords = {
-            ArchitectureDomain.BUSINESS: ["strategy", "capability", "process", "organization", "business"],
-            ArchitectureDomain.DATA: ["data", "information", "database", "warehouse", "quality", "governance"],
-            ArchitectureDomain.APPLICATION: ["application", "system", "service", "interface", "api", "microservice"],
-            ArchitectureDomain.TECHNOLOGY: ["infrastructure", "cloud", "server", "network", "security", "platform"]
+            ArchitectureDomain.BUSINESS: ["strategy", "capability", "process", "organization", "business",
+                                          "business capability", "operating model"],
+            ArchitectureDomain.DATA: ["data", "information", "database", "warehouse", "quality", "governance",
+                                      "data warehouse", "master data", "data lake"],
+            ArchitectureDomain.APPLICATION: ["application", "system", "service", "interface", "api", "microservice",
+                                             "api gateway", "service bus"],
+            ArchitectureDomain.TECHNOLOGY: ["infrastructure", "cloud", "server", "network", "security", "platform",
+                                            "infrastructure as code", "data center"]
         }
 
         self.nora_layer_keywords = {
-            NORALayer.BUSINESS: ["business", "strategy", "capability", "service"],
-            NORALayer.PROCESS: ["process", "workflow", "procedure", "operation"],
-            NORALayer.APPLICATION: ["application", "system", "software", "component"],
-            NORALayer.TECHNICAL: ["technology", "infrastructure", "hardware", "network"],
-            NORALayer.DATA: ["data", "information", "database", "analytics"],
-            NORALayer.SECURITY: ["security", "compliance", "risk", "control"]
+            NORALayer.BUSINESS: ["business", "strategy", "capability", "service", "business capability"],
+            NORALayer.PROCESS: ["process", "workflow", "procedure", "operation", "process automation"],
+            NORALayer.APPLICATION: ["application", "system", "software", "component", "api gateway"],
+            NORALayer.TECHNICAL: ["technology", "infrastructure", "hardware", "network", "infrastructure as code"],
+            NORALayer.DATA: ["data", "information", "database", "analytics", "master data", "data warehouse"],
+            NORALayer.SECURITY: ["security", "compliance", "risk", "control", "zero trust"]
         }
 
-    def analyze_requirements(self, text: str) -> Dict:
-        """Analyze free-text requirements and classify them"""
-        doc = nlp(text.lower())
-
-        domain_scores = {d: 0 for d in ArchitectureDomain}
-        for token in doc:
-            for domain, keywords in self.domain_keywords.items():
-                if token.text in keywords:
-                    domain_scores[domain] += 1
+        self._compile_keyword_index()
+
+    def _compile_keyword_index(self):
+        """Compile the keyword tables into phrase automata and a phrase x (domain + layer) incidence matrix
+
+        Domain and layer phrases get separate automata, so a phrase known to only one table
+        never consumes words the other table would have matched. Features are the domain
+        phrase counts followed by the layer phrase counts. The compiled tables are read-only
+        and shared by every analyzer with the same keyword_version.
+        """
+        self.domains = list(ArchitectureDomain)
+        self.layers = list(NORALayer)
+
+        tables = {
+            "model": NLP_MODEL,
+            "matching": f"{KeywordAutomaton.MATCHING}/per-table",
+            "classifier": f"vector>={self.VECTOR_MIN_SIMILARITY}" if self.use_vectors else "keyword",
+            "domains": {d.name: self.domain_keywords[d] for d in self.domains},
+            "layers": {l.name: self.nora_layer_keywords[l] for l in self.layers}
+        }
+        self.keyword_version = hashlib.sha1(json.dumps(tables, sort_keys=True).encode("utf-8")).hexdigest()[:12]
+
+        with _keyword_index_lock:
+            compiled = _keyword_index_cache.get(self.keyword_version)
+            if compiled is None:
+                compiled = _keyword_index_cache[self.keyword_version] = self._build_keyword_index()
+        self.__dict__.update(compiled)
+
+    def _build_keyword_index(self) -> Dict:
+        domain_vocabulary = sorted({kw for kws in self.domain_keywords.values() for kw in kws})
+        layer_vocabulary = sorted({kw for kws in self.nora_layer_keywords.values() for kw in kws})
+        feature_count = len(domain_vocabulary) + len(layer_vocabulary)
+
+        domain_rows = {phrase: i for i, phrase in enumerate(domain_vocabulary)}
+        layer_rows = {phrase: i for i, phrase in enumerate(layer_vocabulary, start=len(domain_vocabulary))}
+        keyword_matrix = np.zeros((feature_count, len(self.domains) + len(self.layers)), dtype=np.int64)
+        for col, domain in enumerate(self.domains):
+            for kw in self.domain_keywords[domain]:
+                keyword_matrix[domain_rows[kw], col] = 1
+        for col, layer in enumerate(self.layers, start=len(self.domains)):
+            for kw in self.nora_layer_keywords[layer]:
+                keyword_matrix[layer_rows[kw], col] = 1
+        keyword_matrix.setflags(write=False)
+
+        vector_classifier = None
+        if self.use_vectors:
+            vector_classifier = CentroidClassifier(
+                [" ".join(self.domain_keywords[d] + [d.value]) for d in self.domains]
+                + [" ".join(self.nora_layer_keywords[l] + [l.value]) for l in self.layers]
+            )
 
-        layer_scores = {l: 0 for l in NORALayer}
-        for token in doc:
-            for layer, keywords in self.nora_layer_keywords.items():
-                if token.text in keywords:
-                    layer_scores[layer] += 1
+        vocabulary = sorted(set(domain_vocabulary) | set(layer_vocabulary))
+        return {
+            "keyword_index": MappingProxyType({phrase: i for i, phrase in enumerate(vocabulary)}),
+            "keyword_automata": (KeywordAutomaton(domain_vocabulary), KeywordAutomaton(layer_vocabulary)),
+            "layer_feature_offset": len(domain_vocabulary),
+            "feature_count": feature_count,
+            "keyword_matrix": keyword_matrix,
+            "vector_classifier": vector_classifier
+        }
 
-        entities = [(ent.text, ent.label_) for ent in doc.ents]
+    def analyze_requirements(self, text: str, tier: AnalysisTier = AnalysisTier.FULL) -> Dict:
+        """Analyze free-text requirements and classify them"""
+        key = None
+        if self.cache is not None:
+            key = self.cache.make_key(text, f"{self.keyword_version}:{tier.value}")
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+
+        text = text.lower()
+        entities = []
+        if tier is AnalysisTier.FULL:
+            entities = [(ent.text, ent.label_) for ent in get_nlp()(text).ents]
+        result = self._build_result(self._score_texts([text])[0], entities)
+
+        if key is not None:
+            self.cache.put(key, result)
+        return result
+
+    def analyze_requirements_batch(self, texts: Iterable[str], batch_size: int = 256, n_process: int = 1,
+                                   tier: AnalysisTier = AnalysisTier.FULL) -> List[Dict]:
+        """Analyze many requirement texts in one nlp.pipe pass, preserving input order"""
+        texts = list(texts)
+        results = [None] * len(texts)
+        keys = [None] * len(texts)
+
+        if self.cache is not None:
+            for i, text in enumerate(texts):
+                keys[i] = self.cache.make_key(text, f"{self.keyword_version}:{tier.value}")
+                results[i] = self.cache.get(keys[i])
+        pending = [i for i, result in enumerate(results) if result is None]
+        pending_texts = [texts[i].lower() for i in pending]
+
+        if tier is AnalysisTier.FULL:
+            docs = get_nlp().pipe(pending_texts, batch_size=batch_size, n_process=n_process)
+            entity_lists = [[(ent.text, ent.label_) for ent in doc.ents] for doc in docs]
+        else:
+            entity_lists = [[] for _ in pending_texts]
+
+        scores = self._score_texts(pending_texts)
+        for i, row, entities in zip(pending, scores, entity_lists):
+            results[i] = self._build_result(row, entities)
+
+        if self.cache is not None:
+            self.cache.put_many([(keys[i], results[i]) for i in pending])
+        return results
+
+    def analyze_requirements_stream(self, source: Union[str, Iterable[str]], chunk_chars: int = 10000,
+                                    batch_size: int = 64,
+                                    tier: AnalysisTier = AnalysisTier.FULL) -> Iterator[Dict]:
+        """Analyze a large document chunk by chunk, yielding running results after every batch of chunks
+
+        source may be a string or any iterable of lines, such as an open file. Only one batch of
+        chunks is held at a time; the last result yielded covers the whole document.
+        """
+        totals = None
+        entities = {}
+        chunks = 0
+
+        texts = (chunk.lower() for chunk in _iter_text_chunks(source, chunk_chars))
+        if tier is AnalysisTier.FULL:
+            pairs = ((doc.text, doc.ents) for doc in get_nlp().pipe(texts, batch_size=batch_size))
+        else:
+            pairs = ((text, ()) for text in texts)
+
+        for text, ents in pairs:
+            # Features are additive counts for both classifiers, so chunks can be summed before scoring
+            features = self._features([text])[0]
+            totals = features if totals is None else totals + features
+            for ent in ents:
+                entities.setdefault((ent.text, ent.label_), None)
+            chunks += 1
+
+            if chunks % batch_size == 0:
+                yield {**self._build_result(self._scores(totals[np.newaxis])[0], list(entities)), "chunks": chunks}
+
+        if totals is None:
+            totals = self._features([""])[0]
+        yield {**self._build_result(self._scores(totals[np.newaxis])[0], list(entities)), "chunks": chunks}
+
+    def _score_texts(self, texts: List[str]) -> np.ndarray:
+        """Score texts against every domain and layer column, in blocks to bound the feature matrix size"""
+        blocks = [
+            self._scores(self._features(texts[i:i + self.SCORE_BLOCK]))
+            for i in range(0, len(texts), self.SCORE_BLOCK)
+        ]
+        return np.vstack(blocks) if blocks else np.zeros((0, self.keyword_matrix.shape[1]))
+
+    def _features(self, texts: List[str]) -> np.ndarray:
+        if self.vector_classifier is not None:
+            # Keyword counts ride along for the low-similarity fallback in _scores
+            return np.hstack([self.vector_classifier.vectorize(texts), self._keyword_features(texts)])
+        return self._keyword_features(texts)
+
+    def _keyword_features(self, texts: List[str]) -> np.ndarray:
+        domain_automaton, layer_automaton = self.keyword_automata
+        layer_offset = self.layer_feature_offset
+        id_lists = []
+        for text in texts:
+            words = KeywordAutomaton.WORD_PATTERN.findall(text)
+            id_lists.append(domain_automaton.find_words(words)
+                            + [layer_offset + i for i in layer_automaton.find_words(words)])
+        return self._keyword_count_matrix(id_lists)
+
+    def _scores(self, features: np.ndarray) -> np.ndarray:
+        if self.vector_classifier is None:
+            return features @ self.keyword_matrix
+
+        n_hashed = self.vector_classifier.n_features
+        scores = self.vector_classifier.score_counts(features[:, :n_hashed])
+        keyword_scores = features[:, n_hashed:] @ self.keyword_matrix
+        n_domains = len(self.domains)
+        for block in (slice(0, n_domains), slice(n_domains, None)):
+            weak = scores[:, block].max(axis=1) < self.VECTOR_MIN_SIMILARITY
+            scores[weak, block] = keyword_scores[weak, block]
+        return scores
+
+    def _keyword_count_matrix(self, id_lists: List[List[int]]) -> np.ndarray:
+        # The vocabulary is a few dozen terms, so a dense docs x vocabulary count
+        # matrix filled by one bincount is cheaper than building a sparse one
+        vocab_size = self.feature_count
+        flat_ids = [row * vocab_size + i for row, ids in enumerate(id_lists) for i in ids]
+        counts = np.bincount(flat_ids, minlength=len(id_lists) * vocab_size)
+        return counts.reshape(len(id_lists), vocab_size)
+
+    def _build_result(self, scores: np.ndarray, entities: List) -> Dict:
+        n_domains = len(self.domains)
+        as_score = (lambda s: round(float(s), 4)) if scores.dtype.kind == "f" else int
+        domain_scores = {d: as_score(s) for d, s in zip(self.domains, scores[:n_domains])}
+        layer_scores = {l: as_score(s) for l, s in zip(self.layers, scores[n_domains:])}
 
         return {
-            "primary_domain": max(domain_scores.items(), key=lambda x: x[1])[0],
+            "primary_domain": self.domains[int(np.argmax(scores[:n_domains]))],
             "domain_scores": domain_scores,
-            "primary_layer": max(layer_scores.items(), key=lambda x: x[1])[0],
+            "primary_layer": self.layers[int(np.argmax(scores[n_domains:]))],
             "layer_scores": layer_scores,
             "entities": entities
         }
 
 
+# Framework catalogs, parsed once per process
+FRAMEWORKS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "frameworks.json")
+
+
+@functools.lru_cache(maxsize=None)
+def load_framework_catalog(path: str = FRAMEWORKS_PATH) -> Mapping:
+    """Parse the TOGAF/NORA/best-practice catalog file into shared read-only mappings
+
+    The returned "version" combines the file's declared version with a hash of its
+    contents, so it changes whenever the catalog does and can be used in cache keys.
+    """
+    with open(path, "rb") as f:
+        content = f.read()
+    data = json.loads(content)
+
+    catalog = {
+        name: MappingProxyType({key: tuple(items) for key, items in data[name].items()})
+        for name in ("togaf_principles", "nora_standards", "best_practices")
+    }
+    catalog["version"] = f"{data['version']}-{hashlib.sha1(content).hexdigest()[:12]}"
+    return MappingProxyType(catalog)
+
+
+def stable_hash(*parts) -> int:
+    """64-bit hash of the parts that, unlike hash(), is the same in every process"""
+    digest = hashlib.blake2b("\0".join(str(p) for p in parts).encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "little")
+
+
+def _splitmix64(x: np.ndarray) -> np.ndarray:
+    x = x + np.uint64(0x9E3779B97F4A7C15)
+    x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return x ^ (x >> np.uint64(31))
+
+
+def content_key(identity: Optional[str], description: Optional[str]) -> int:
+    """Stable key of a component's identity and description, the per-component part of its score seed"""
+    return stable_hash(identity or "", description or "")
+
+
+def hashed_randint(keys: np.ndarray, stream: int, low: int, high: int) -> np.ndarray:
+    """Deterministic integers in [low, high) derived from per-component keys, vectorized over keys"""
+    draws = _splitmix64(_splitmix64(keys) + np.uint64(stream))
+    return (low + draws % np.uint64(high - low)).astype(np.int64)
+
+
+class RuleTable:
+    """Compiled recommendation rules: (rule id, column, operator, threshold, text template) rows
+
+    Rules are evaluated over a whole DataFrame as boolean masks; rule texts are only
+    formatted when expand() is called for display.
+    """
+
+    OPERATORS = {
+        "<": lambda values, threshold: values < threshold,
+        ">": lambda values, threshold: values > threshold,
+        "in": lambda values, allowed: values.isin(allowed) if isinstance(values, pd.Series) else values in allowed
+    }
+
+    def __init__(self, rules: List[Tuple]):
+        self.rules = rules
+        self.ids = np.array([rule[0] for rule in rules], dtype=object)
+        self.templates = {rule[0]: rule[4] for rule in rules}
+        self.fields = {
+            rule[0]: tuple(name for _, name, _, _ in string.Formatter().parse(rule[4]) if name)
+            for rule in rules
+        }
+
+    def evaluate(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Return a components x rules boolean mask with rule ids as columns"""
+        return pd.DataFrame({
+            rule_id: np.asarray(self.OPERATORS[op](df[column], threshold), dtype=bool)
+            for rule_id, column, op, threshold, _ in self.rules
+        }, index=df.index, columns=list(self.ids))
+
+    def rule_ids(self, mask: pd.DataFrame) -> List[np.ndarray]:
+        """Split a mask from evaluate() into one array of matched rule ids per component"""
+        return [self.ids[row] for row in mask.to_numpy()]
+
+    def evaluate_record(self, record: Dict) -> List[str]:
+        return [
+            rule_id for rule_id, column, op, threshold, _ in self.rules
+            if self.OPERATORS[op](record[column], threshold)
+        ]
+
+    def expand(self, rule_ids: Iterable[str], context: Dict) -> List[str]:
+        """Format the text of each rule id, filling template fields from context"""
+        return [self.templates[rule_id].format(**context) for rule_id in rule_ids]
+
+    def action_key(self, rule_id: str, context: Dict) -> Tuple:
+        """Identity of the action a rule produces: its id plus the values of its template fields"""
+        return (rule_id,) + tuple(context[field] for field in self.fields[rule_id])
+
+
 class ArchitectureAssessor:
-    def __init__(self):
+    RECOMMENDATION_RULES = RuleTable([
+        ("TOGAF_REVIEW", "togaf_compliance", "<", 70,
+         "Increase TOGAF compliance by conducting architecture review against {domain} principles"),
+        ("NORA_STANDARDS", "nora_alignment", "<", 65,
+         "Improve NORA alignment by implementing {layer} standards"),
+        ("DEBT_PRIORITIZE", "technical_debt", ">", 50,
+         "Prioritize technical debt reduction in next planning cycle"),
+        ("DEBT_WORKSHOP", "technical_debt", ">", 50,
+         "Conduct technical debt assessment workshop"),
+        ("CAPABILITY_MAPPING", "business_alignment", "<", 60,
+         "Implement business capability mapping to improve alignment")
+    ])
+
+    # (low, high) ranges of the randomized part of each compliance score
+    SCORE_RANGES = {
+        "togaf_compliance": (10, 30),
+        "nora_alignment": (5, 25),
+        "business_alignment": (40, 90),
+        "technical_debt": (10, 80)
+    }
+
+    def __init__(self, deterministic: bool = False, seed: int = 0):
+        self.deterministic = deterministic
+        self.seed = seed
         self.togaf_principles = self._load_togaf_principles()
         self.nora_standards = self._load_nora_standards()
         self.best_practices = self._load_best_practices()
+        self.catalog_version = load_framework_catalog()["version"]
 
-    def _load_togaf_principles(self) -> Dict:
-        return {
-            "Business": [
-                "Business continuity",
-                "Business alignment",
-                "Process standardization",
-                "Capability-based planning"
-            ],
-            "Data": [
-                "Data is an asset",
-                "Data is shared",
-                "Data is accessible",
-                "Data trustee responsibility"
-            ],
-            "Application": [
-                "Application modularity",
-                "Service orientation",
-                "Component reuse",
-                "Loose coupling"
-            ],
-            "Technology": [
-                "Technology standardization",
-                "Interoperability",
-                "Scalability",
-                "Security by design"
-            ]
-        }
+    def _load_togaf_principles(self) -> Mapping:
+        return load_framework_catalog()["togaf_principles"]
 
-    def _load_nora_standards(self) -> Dict:
-        return {
-            "Business Layer": [
-                "Service orientation",
-                "Citizen-centric design",
-                "Organizational agility"
-            ],
-            "Process Layer": [
-                "Process automation",
-                "Straight-through processing",
-                "Workflow transparency"
-            ],
-            "Application Layer": [
-                "API-first design",
-                "Cloud-native principles",
-                "Microservice architecture"
-            ],
-            "Technical Layer": [
-                "Infrastructure as code",
-                "Zero trust security",
-                "Hybrid cloud enablement"
-            ],
-            "Data Layer": [
-                "Data sovereignty",
-                "Metadata management",
-                "Master data management"
-            ],
-            "Security Layer": [
-                "Privacy by design",
-                "Continuous monitoring",
-                "Defense in depth"
-            ]
-        }
+    def _load_nora_standards(self) -> Mapping:
+        return load_framework_catalog()["nora_standards"]
 
-    def _load_best_practices(self) -> Dict:
-        return {
-            "Modernization": [
-                "Incremental modernization",
-                "Strangler pattern adoption",
-                "Technical debt management"
-            ],
-            "Governance": [
-                "Architecture review boards",
-                "Compliance automation",
-                "Policy as code"
-            ],
-            "Integration": [
-                "Event-driven architecture",
-                "API gateway pattern",
-                "Enterprise service bus"
-            ]
-        }
+    def _load_best_practices(self) -> Mapping:
+        return load_framework_catalog()["best_practices"]
 
     def assess_compliance(self, component: Dict) -> Dict:
         """Assess component against architecture frameworks"""
@@ -179,37 +922,139 @@ class ArchitectureAssessor:
         domain_principles = self.togaf_principles.get(domain.name, [])
         layer_standards = self.nora_standards.get(layer.value, [])
 
+        keys = None
+        if self.deterministic:
+            keys = self.component_keys(
+                np.array([list(ArchitectureDomain).index(domain)]),
+                np.array([list(NORALayer).index(layer)]),
+                np.array([content_key(component_id(component), component.get("description"))], dtype=np.uint64)
+            )
+        draws = {name: int(values[0]) for name, values in self._draw_scores(keys, 1).items()}
+
         compliance = {
-            "togaf_compliance": min(100, len(domain_principles) * 10 + np.random.randint(10, 30)),
-            "nora_alignment": min(100, len(layer_standards) * 12 + np.random.randint(5, 25)),
-            "business_alignment": np.random.randint(40, 90),
-            "technical_debt": np.random.randint(10, 80),
+            "togaf_compliance": min(100, len(domain_principles) * 10 + draws["togaf_compliance"]),
+            "nora_alignment": min(100, len(layer_standards) * 12 + draws["nora_alignment"]),
+            "business_alignment": draws["business_alignment"],
+            "technical_debt": draws["technical_debt"],
             "domain": domain.name,
             "layer": layer.value
         }
         return compliance
 
+    def component_keys(self, domain_codes: np.ndarray, layer_codes: np.ndarray,
+                       content_keys: np.ndarray) -> np.ndarray:
+        """Stable per-component keys that seed the deterministic scores, mixing seed, domain, layer and content"""
+        context = (np.uint64(self.seed & 0xFFFFFFFF) * np.uint64(64)
+                   + domain_codes.astype(np.uint64) * np.uint64(8) + layer_codes.astype(np.uint64))
+        return _splitmix64(content_keys.astype(np.uint64) ^ _splitmix64(context))
+
+    def _draw_scores(self, keys: Optional[np.ndarray], n: int) -> Dict[str, np.ndarray]:
+        if not self.deterministic:
+            return {name: np.random.randint(low, high, n) for name, (low, high) in self.SCORE_RANGES.items()}
+        return {
+            name: hashed_randint(keys, stream, low, high)
+            for stream, (name, (low, high)) in enumerate(self.SCORE_RANGES.items())
+        }
+
+    def assess_compliance_frame(self, df: Union[pd.DataFrame, "ComponentStore"]) -> pd.DataFrame:
+        """Assess a whole inventory at once
+
+        df is either a ComponentStore or a DataFrame with optional domain/layer columns, one row per component.
+        """
+        domains = list(ArchitectureDomain)
+        layers = list(NORALayer)
+        if isinstance(df, ComponentStore):
+            domain_codes, layer_codes = df.records["domain"], df.records["layer"]
+        else:
+            domain_codes = enum_codes(df, "domain", ArchitectureDomain, ArchitectureDomain.BUSINESS)
+            layer_codes = enum_codes(df, "layer", NORALayer, NORALayer.BUSINESS)
+
+        principle_counts = np.array([len(self.togaf_principles.get(d.name, [])) for d in domains])
+        standard_counts = np.array([len(self.nora_standards.get(l.value, [])) for l in layers])
+
+        domain_names = np.array([d.name for d in domains])[domain_codes]
+        layer_values = np.array([l.value for l in layers])[layer_codes]
+
+        keys = None
+        if self.deterministic:
+            if isinstance(df, ComponentStore):
+                content_keys = df.records["content_key"]
+            else:
+                content_keys = ComponentStore.frame_content_keys(df)
+            keys = self.component_keys(domain_codes, layer_codes, content_keys)
+        draws = self._draw_scores(keys, len(df))
+
+        return pd.DataFrame({
+            "togaf_compliance": np.minimum(100, principle_counts[domain_codes] * 10 + draws["togaf_compliance"]),
+            "nora_alignment": np.minimum(100, standard_counts[layer_codes] * 12 + draws["nora_alignment"]),
+            "business_alignment": draws["business_alignment"],
+            "technical_debt": draws["technical_debt"],
+            "domain": domain_names,
+            "layer": layer_values
+        }, index=df.index if isinstance(df, pd.DataFrame) else None)
+
+    def recommendation_ids(self, assessment: Dict) -> List[str]:
+        return self.RECOMMENDATION_RULES.evaluate_record(assessment)
+
     def generate_recommendations(self, assessment: Dict) -> List[str]:
-        recommendations = []
+        return self.RECOMMENDATION_RULES.expand(self.recommendation_ids(assessment), assessment)
 
-        if assessment["togaf_compliance"] < 70:
-            recommendations.append(
-                f"Increase TOGAF compliance by conducting architecture review against {assessment['domain']} principles"
-            )
-        if assessment["nora_alignment"] < 65:
-            recommendations.append(
-                f"Improve NORA alignment by implementing {assessment['layer']} standards"
-            )
-        if assessment["technical_debt"] > 50:
-            recommendations.extend([
-                "Prioritize technical debt reduction in next planning cycle",
-                "Conduct technical debt assessment workshop"
-            ])
-        if assessment["business_alignment"] < 60:
-            recommendations.append(
-                "Implement business capability mapping to improve alignment"
-            )
-        return recommendations
+    def recommend_frame(self, assessed: pd.DataFrame) -> List[np.ndarray]:
+        """Recommendation ids for every row of an assess_compliance_frame() result"""
+        return self.RECOMMENDATION_RULES.rule_ids(self.RECOMMENDATION_RULES.evaluate(assessed))
+
+
+def _compile_risk_factors(risk_factors: Dict, unknown_score: int):
+    """Compile RISK_FACTORS into per-factor value->code maps and a padded factor x code score matrix
+
+    Code 0 of each factor is its default value and code len(values) stands for unknown values.
+    Weights are applied only in _compile_risk_table, which precomputes every weighted total.
+    """
+    factor_codes = {
+        factor: {value: code for code, value in enumerate(config["values"])}
+        for factor, config in risk_factors.items()
+    }
+    width = max(len(config["values"]) for config in risk_factors.values()) + 1
+
+    score_matrix = np.full((len(risk_factors), width), unknown_score, dtype=np.float64)
+    for row, config in enumerate(risk_factors.values()):
+        score_matrix[row, :len(config["values"])] = list(config["values"].values())
+
+    return list(risk_factors), factor_codes, score_matrix
+
+
+def _compile_risk_table(risk_factors: Dict, unknown_score: int, thresholds: List[int]):
+    """Precompute total score and risk level for every combination of factor codes
+
+    Returns per-factor (score, weighted) entries, the code-space dimensions and strides, and the
+    flat total-score and risk-level tables. Totals are accumulated in factor order, exactly as a
+    per-component loop would, so table lookups match a direct computation bit for bit.
+    """
+    entries = []
+    for config in risk_factors.values():
+        scores = list(config["values"].values()) + [unknown_score]
+        entries.append([(score, score * config["weight"]) for score in scores])
+
+    dims = tuple(len(factor_entries) for factor_entries in entries)
+    totals = np.zeros(dims)
+    for axis, factor_entries in enumerate(entries):
+        shape = [1] * len(dims)
+        shape[axis] = dims[axis]
+        totals = totals + np.array([weighted for _, weighted in factor_entries]).reshape(shape)
+
+    strides = np.array([int(np.prod(dims[axis + 1:])) for axis in range(len(dims))], dtype=np.intp)
+    totals = totals.ravel()
+    return entries, dims, strides, totals, np.digitize(totals, thresholds)
+
+
+def _compile_mitigation_table(rules: "RuleTable", factor_names: List[str], entries: List, dims: Tuple,
+                              level_table: np.ndarray, levels: List["RiskLevel"]) -> List[Tuple[str, ...]]:
+    """Evaluate the mitigation rules once for every factor-code combination"""
+    codes = np.unravel_index(np.arange(len(level_table)), dims)
+    frame = pd.DataFrame({"risk_level": np.array(levels, dtype=object)[level_table]})
+    for axis, factor in enumerate(factor_names):
+        frame[f"{factor}_score"] = np.array([score for score, _ in entries[axis]])[codes[axis]]
+    return [tuple(ids) for ids in rules.rule_ids(rules.evaluate(frame))]
 
 
 class RiskAssessor:
@@ -221,76 +1066,593 @@ class RiskAssessor:
         "documentation": {"weight": 0.1, "values": {"excellent": 10, "good": 30, "fair": 50, "poor": 80}},
         "support": {"weight": 0.1, "values": {"vendor": 20, "in-house": 40, "none": 70}}
     }
+    UNKNOWN_SCORE = 50
+    RISK_THRESHOLDS = [30, 50, 70]
+    RISK_LEVELS = [RiskLevel.LOW, RiskLevel.MEDIUM, RiskLevel.HIGH, RiskLevel.CRITICAL]
+
+    FACTOR_NAMES, FACTOR_CODES, SCORE_MATRIX = _compile_risk_factors(RISK_FACTORS, UNKNOWN_SCORE)
+    FACTOR_DEFAULTS = {factor: next(iter(config["values"])) for factor, config in RISK_FACTORS.items()}
+    FACTOR_ENTRIES, CODE_DIMS, CODE_STRIDES, TOTAL_TABLE, LEVEL_TABLE = _compile_risk_table(
+        RISK_FACTORS, UNKNOWN_SCORE, RISK_THRESHOLDS
+    )
+
+    MITIGATION_RULES = RuleTable(
+        [("MODERNIZE", "risk_level", "in", (RiskLevel.HIGH, RiskLevel.CRITICAL),
+          "Prioritize for modernization or replacement")]
+        + [(f"ADDRESS_{factor.upper()}", f"{factor}_score", ">", 60,
+            f"Address {factor.replace('_', ' ')} risk through targeted intervention") for factor in RISK_FACTORS]
+        + [("IMMEDIATE_REVIEW", "risk_level", "in", (RiskLevel.CRITICAL,),
+            "Immediate architecture review required"),
+           ("CONTINGENCY_PLAN", "risk_level", "in", (RiskLevel.CRITICAL,),
+            "Develop contingency plan for failure scenarios")]
+    )
+    MITIGATION_TABLE = _compile_mitigation_table(
+        MITIGATION_RULES, FACTOR_NAMES, FACTOR_ENTRIES, CODE_DIMS, LEVEL_TABLE, RISK_LEVELS
+    )
 
     def assess_risk(self, component: Dict) -> Dict:
-        total_score = 0
-        factor_scores = {}
+        codes = self.component_codes(component)
+        combination = int(codes @ self.CODE_STRIDES)
 
-        for factor, config in self.RISK_FACTORS.items():
-            value = component.get(factor, list(config["values"].keys())[0])
-            score = config["values"].get(value, 50)
-            weighted_score = score * config["weight"]
+        factor_scores = {}
+        for factor, code, entries in zip(self.FACTOR_NAMES, codes, self.FACTOR_ENTRIES):
+            score, weighted_score = entries[code]
             factor_scores[factor] = {"score": score, "weighted": weighted_score}
-            total_score += weighted_score
-
-        if total_score < 30:
-            risk_level = RiskLevel.LOW
-        elif total_score < 50:
-            risk_level = RiskLevel.MEDIUM
-        elif total_score < 70:
-            risk_level = RiskLevel.HIGH
-        else:
-            risk_level = RiskLevel.CRITICAL
 
         return {
-            "total_score": round(total_score, 1),
-            "risk_level": risk_level,
+            "total_score": round(float(self.TOTAL_TABLE[combination]), 1),
+            "risk_level": self.RISK_LEVELS[self.LEVEL_TABLE[combination]],
             "factor_scores": factor_scores
         }
 
+    def component_codes(self, component: Dict) -> np.ndarray:
+        """Factor codes of one component; unknown values map to each factor's last code
+
+        Missing, None and NaN values all take the factor default, as they do in risk_codes,
+        where a DataFrame cannot tell them apart.
+        """
+        codes = []
+        for factor in self.FACTOR_NAMES:
+            value = component.get(factor)
+            if value is None or value != value:
+                value = self.FACTOR_DEFAULTS[factor]
+            codes.append(self.FACTOR_CODES[factor].get(value, len(self.FACTOR_CODES[factor])))
+        return np.array(codes, dtype=np.intp)
+
+    def risk_codes(self, df: pd.DataFrame) -> np.ndarray:
+        """Return the components x factors code matrix; missing values take the factor default"""
+        codes = np.zeros((len(df), len(self.FACTOR_NAMES)), dtype=np.intp)
+
+        for col, factor in enumerate(self.FACTOR_NAMES):
+            if factor not in df:
+                continue
+            values = df[factor]
+            mapped = values.map(self.FACTOR_CODES[factor])
+            codes[:, col] = mapped.fillna(len(self.FACTOR_CODES[factor])).to_numpy(dtype=np.intp)
+            codes[values.isna().to_numpy(), col] = 0
+        return codes
+
+    def assess_risk_frame(self, df: Union[pd.DataFrame, "ComponentStore"]) -> pd.DataFrame:
+        """Assess a whole inventory at once
+
+        df is either a ComponentStore or a DataFrame with optional risk factor columns, one row per component.
+        """
+        codes = df.risk_codes() if isinstance(df, ComponentStore) else self.risk_codes(df)
+        factor_scores = self.SCORE_MATRIX[np.arange(len(self.FACTOR_NAMES)), codes]
+        combinations = codes @ self.CODE_STRIDES
+        total_scores = self.TOTAL_TABLE[combinations]
+        levels = self.LEVEL_TABLE[combinations]
+
+        frame = pd.DataFrame({
+            "total_score": np.round(total_scores, 1),
+            "risk_level": np.array(self.RISK_LEVELS, dtype=object)[levels]
+        }, index=df.index if isinstance(df, pd.DataFrame) else None)
+        for col, factor in enumerate(self.FACTOR_NAMES):
+            frame[f"{factor}_score"] = factor_scores[:, col].astype(np.int64)
+        return frame
+
+    def mitigation_ids(self, risk_assessment: Dict) -> List[str]:
+        record = {"risk_level": risk_assessment["risk_level"]}
+        for factor, scores in risk_assessment["factor_scores"].items():
+            record[f"{factor}_score"] = scores["score"]
+        return self.MITIGATION_RULES.evaluate_record(record)
+
     def generate_risk_mitigation(self, risk_assessment: Dict) -> List[str]:
-        mitigations = []
-        risk_level = risk_assessment["risk_level"]
+        # Mitigation templates have no fields, so the assessment itself serves as context
+        return self.MITIGATION_RULES.expand(self.mitigation_ids(risk_assessment), risk_assessment)
+
+    def mitigate_frame(self, risk: pd.DataFrame) -> List[np.ndarray]:
+        """Mitigation ids for every row of an assess_risk_frame() result"""
+        return self.MITIGATION_RULES.rule_ids(self.MITIGATION_RULES.evaluate(risk))
+
+    def lookup_mitigations(self, component: Dict) -> Tuple[str, ...]:
+        """Precomputed mitigation ids for a component's factor combination"""
+        return self.MITIGATION_TABLE[int(self.component_codes(component) @ self.CODE_STRIDES)]
+
+    def what_if(self, component: Dict) -> Dict:
+        """Score and level the component would get for every single-factor change, read from the precomputed tables"""
+        codes = self.component_codes(component)
+        combination = int(codes @ self.CODE_STRIDES)
+        base_total = self.TOTAL_TABLE[combination]
+        base_level = self.LEVEL_TABLE[combination]
+
+        changes = {}
+        for axis, factor in enumerate(self.FACTOR_NAMES):
+            alternatives = []
+            for value, code in self.FACTOR_CODES[factor].items():
+                if code == codes[axis]:
+                    continue
+                alt = combination + (code - codes[axis]) * self.CODE_STRIDES[axis]
+                alternatives.append({
+                    "value": value,
+                    "total_score": round(float(self.TOTAL_TABLE[alt]), 1),
+                    "score_change": round(float(self.TOTAL_TABLE[alt] - base_total), 1),
+                    "risk_level": self.RISK_LEVELS[self.LEVEL_TABLE[alt]],
+                    "level_change": int(self.LEVEL_TABLE[alt]) - int(base_level),
+                    "mitigation_ids": self.MITIGATION_TABLE[alt]
+                })
+            changes[factor] = alternatives
 
-        if risk_level in [RiskLevel.HIGH, RiskLevel.CRITICAL]:
-            mitigations.append("Prioritize for modernization or replacement")
+        return {
+            "total_score": round(float(base_total), 1),
+            "risk_level": self.RISK_LEVELS[base_level],
+            "changes": changes
+        }
 
-        for factor, scores in risk_assessment["factor_scores"].items():
-            if scores["score"] > 60:
-                mitigations.append(
-                    f"Address {factor.replace('_', ' ')} risk through targeted intervention"
-                )
 
-        if risk_level == RiskLevel.CRITICAL:
-            mitigations.extend([
-                "Immediate architecture review required",
-                "Develop contingency plan for failure scenarios"
-            ])
+class ComponentStore:
+    """Compact inventory: one 16-byte record of categorical codes per component
+
+    Domain and layer codes follow enum definition order, risk factor codes follow
+    RiskAssessor.FACTOR_CODES (0 is the default value, the last code means unknown), and
+    content_key holds the identity/description hash that seeds deterministic scoring.
+    Ids are kept separately and are optional.
+    """
 
-        return mitigations
+    FACTORS = RiskAssessor.FACTOR_NAMES
+    DTYPE = np.dtype(
+        [("domain", np.int8), ("layer", np.int8)]
+        + [(factor, np.int8) for factor in RiskAssessor.FACTOR_NAMES]
+        + [("content_key", np.uint64)]
+    )
 
+    def __init__(self, records: np.ndarray, ids: Optional[List[str]] = None):
+        self.records = records
+        self.ids = ids
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, keep_ids: bool = True) -> "ComponentStore":
+        records = np.zeros(len(df), dtype=cls.DTYPE)
+        records["domain"] = enum_codes(df, "domain", ArchitectureDomain, ArchitectureDomain.BUSINESS)
+        records["layer"] = enum_codes(df, "layer", NORALayer, NORALayer.BUSINESS)
+        codes = RiskAssessor().risk_codes(df)
+        for col, factor in enumerate(cls.FACTORS):
+            records[factor] = codes[:, col]
+        records["content_key"] = cls.frame_content_keys(df)
+
+        ids = None
+        if keep_ids:
+            ids = [identity or name for identity, name in zip(_optional_column(df, "id"), _optional_column(df, "name"))]
+        return cls(records, ids)
+
+    @classmethod
+    def from_components(cls, components: List[Dict], keep_ids: bool = True) -> "ComponentStore":
+        return cls.from_frame(pd.DataFrame(components), keep_ids=keep_ids)
+
+    @staticmethod
+    def frame_content_keys(df: pd.DataFrame) -> np.ndarray:
+        identities = _optional_column(df, "id")
+        names = _optional_column(df, "name")
+        descriptions = _optional_column(df, "description")
+        return np.array([
+            content_key(identity or name, description)
+            for identity, name, description in zip(identities, names, descriptions)
+        ], dtype=np.uint64)
+
+    def risk_codes(self) -> np.ndarray:
+        """Return the components x factors code matrix expected by RiskAssessor"""
+        return np.stack([self.records[factor].astype(np.intp) for factor in self.FACTORS], axis=1)
+
+    def to_frame(self) -> pd.DataFrame:
+        """Decode the store back into a DataFrame of enum members and factor values"""
+        frame = pd.DataFrame({
+            "domain": np.array(list(ArchitectureDomain), dtype=object)[self.records["domain"]],
+            "layer": np.array(list(NORALayer), dtype=object)[self.records["layer"]]
+        })
+        for factor in self.FACTORS:
+            # Unknown codes decode to a value outside the factor's vocabulary so they stay unknown
+            values = np.array(list(RiskAssessor.FACTOR_CODES[factor]) + ["unknown"], dtype=object)
+            frame[factor] = values[self.records[factor]]
+        if self.ids is not None:
+            frame.insert(0, "id", self.ids)
+        return frame
+
+
+class EntityIndex:
+    """Inverted index from normalized entity text and label to the components that mention them"""
+
+    def __init__(self):
+        self.by_entity = {}
+        self.by_text = {}
+        self.by_label = {}
+        self._component_entities = {}
+
+    @staticmethod
+    def normalize(text: str) -> str:
+        return " ".join(text.lower().split())
+
+    def add(self, component_id: str, entities: List[Tuple[str, str]]):
+        """Index a component's entities, replacing whatever was indexed for it before"""
+        self.remove(component_id)
+
+        keys = {(self.normalize(text), label) for text, label in entities}
+        self._component_entities[component_id] = keys
+        for key in keys:
+            text, label = key
+            self.by_entity.setdefault(key, set()).add(component_id)
+            self.by_text.setdefault(text, set()).add(component_id)
+            self.by_label.setdefault(label, set()).add(component_id)
+
+    def remove(self, component_id: str):
+        for key in self._component_entities.pop(component_id, ()):
+            text, label = key
+            for index, index_key in ((self.by_entity, key), (self.by_text, text), (self.by_label, label)):
+                ids = index[index_key]
+                ids.discard(component_id)
+                # A text can still be held through another label, so only drop empty sets
+                if not ids:
+                    del index[index_key]
+
+    def lookup(self, text: Optional[str] = None, label: Optional[str] = None) -> Set[str]:
+        """Return the ids of components mentioning an entity text, an entity label, or both"""
+        if text is not None and label is not None:
+            ids = self.by_entity.get((self.normalize(text), label))
+        elif text is not None:
+            ids = self.by_text.get(self.normalize(text))
+        elif label is not None:
+            ids = self.by_label.get(label)
+        else:
+            raise ValueError("lookup() needs an entity text, a label, or both")
+        return set(ids) if ids else set()
+
+    def to_dict(self) -> Dict:
+        return {
+            component_id: sorted(list(key) for key in keys)
+            for component_id, keys in self._component_entities.items()
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "EntityIndex":
+        index = cls()
+        for component_id, entities in data.items():
+            index.add(component_id, [tuple(ent) for ent in entities])
+        return index
+
+    def save(self, path: str):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f)
+
+    @classmethod
+    def load(cls, path: str) -> "EntityIndex":
+        with open(path, encoding="utf-8") as f:
+            return cls.from_dict(json.load(f))
+
+
+class StreamingHistogram:
+    """Fixed-range histogram that doubles as a constant-memory quantile sketch
+
+    Scores are bounded, so fine fixed bins give quantiles accurate to half a bin width
+    no matter how many values are added.
+    """
+
+    def __init__(self, low: float = 0.0, high: float = 100.0, bins: int = 1000):
+        self.low = low
+        self.high = high
+        self.bins = bins
+        self.counts = np.zeros(bins, dtype=np.int64)
+        self.total = 0.0
+
+    @property
+    def count(self) -> int:
+        return int(self.counts.sum())
+
+    def bin_index(self, values: np.ndarray) -> np.ndarray:
+        scaled = (np.asarray(values, dtype=np.float64) - self.low) / (self.high - self.low) * self.bins
+        return np.clip(scaled.astype(np.intp), 0, self.bins - 1)
+
+    def add(self, values):
+        if isinstance(values, (int, float, np.number)):
+            # One value per analyze_component call; a bincount over all bins would dominate it
+            value = float(values)
+            b = int((value - self.low) / (self.high - self.low) * self.bins)
+            self.counts[min(max(b, 0), self.bins - 1)] += 1
+            self.total += value
+            return
+        values = np.atleast_1d(np.asarray(values, dtype=np.float64))
+        self.counts += np.bincount(self.bin_index(values), minlength=self.bins)
+        self.total += float(values.sum())
+
+    def add_counts(self, counts: np.ndarray, total: float):
+        self.counts += counts
+        self.total += total
+
+    def merge(self, other: "StreamingHistogram"):
+        self.add_counts(other.counts, other.total)
+
+    def mean(self) -> Optional[float]:
+        count = self.count
+        return self.total / count if count else None
+
+    def quantile(self, q: float) -> Optional[float]:
+        count = self.count
+        if not count:
+            return None
+        cumulative = np.cumsum(self.counts)
+        target = q * count
+        b = int(np.searchsorted(cumulative, target))
+        b = min(b, self.bins - 1)
+        before = cumulative[b - 1] if b else 0
+        fraction = (target - before) / self.counts[b] if self.counts[b] else 0.0
+        width = (self.high - self.low) / self.bins
+        return float(self.low + (b + fraction) * width)
+
+    def histogram(self, bins: int = 10) -> Tuple[np.ndarray, np.ndarray]:
+        """Counts re-binned into a coarser histogram, with bin edges, for charts
+
+        When bins does not divide the fine bin count, coarse bins differ in width by one fine bin.
+        """
+        if not 1 <= bins <= self.bins:
+            raise ValueError(f"bins must be between 1 and {self.bins}, got {bins}")
+        starts = np.arange(bins) * self.bins // bins
+        edges = self.low + np.append(starts, self.bins) * (self.high - self.low) / self.bins
+        return np.add.reduceat(self.counts, starts), edges
+
+
+class PortfolioAggregates:
+    """Per-domain and per-layer streaming distributions of compliance and risk scores"""
+
+    METRICS = ["total_score", "togaf_compliance", "nora_alignment", "business_alignment", "technical_debt"]
+    GROUPINGS = ["all", "domain", "layer"]
+
+    def __init__(self, bins: int = 1000):
+        self.bins = bins
+        self.histograms = {}
+
+    def _histogram(self, metric: str, grouping: str, group: str) -> StreamingHistogram:
+        key = (metric, grouping, group)
+        if key not in self.histograms:
+            self.histograms[key] = StreamingHistogram(bins=self.bins)
+        return self.histograms[key]
+
+    def add(self, assessment: Dict, risk_assessment: Dict):
+        """Add one component's assess_compliance and assess_risk results"""
+        groups = {"all": "all", "domain": assessment["domain"], "layer": assessment["layer"]}
+        values = {metric: assessment[metric] for metric in self.METRICS if metric in assessment}
+        values["total_score"] = risk_assessment["total_score"]
+
+        for metric, value in values.items():
+            for grouping, group in groups.items():
+                self._histogram(metric, grouping, group).add(value)
+
+    def add_frame(self, assessed: pd.DataFrame, risk: pd.DataFrame):
+        """Add aligned assess_compliance_frame and assess_risk_frame results in bulk"""
+        metric_values = {metric: assessed[metric].to_numpy() for metric in self.METRICS if metric in assessed}
+        metric_values["total_score"] = risk["total_score"].to_numpy()
+        groupings = {
+            "all": np.zeros(len(assessed), dtype=np.intp),
+            "domain": assessed["domain"].to_numpy(),
+            "layer": assessed["layer"].to_numpy()
+        }
+
+        for grouping, labels in groupings.items():
+            groups, inverse = (["all"], labels) if grouping == "all" else np.unique(labels, return_inverse=True)
+            for metric, values in metric_values.items():
+                sketch = StreamingHistogram(bins=self.bins)
+                flat = inverse * self.bins + sketch.bin_index(values)
+                counts = np.bincount(flat, minlength=len(groups) * self.bins).reshape(len(groups), self.bins)
+                totals = np.bincount(inverse, weights=values.astype(np.float64), minlength=len(groups))
+                for g, group in enumerate(groups):
+                    self._histogram(metric, grouping, str(group)).add_counts(counts[g], float(totals[g]))
+
+    def quantiles(self, metric: str, by: str = "domain", qs: Iterable[float] = (0.5, 0.9, 0.99)) -> Dict:
+        """Quantiles of a metric for every group of a grouping, e.g. {"DATA": {"p50": ..., "p90": ...}}"""
+        return {
+            group: {f"p{round(q * 100):g}": histogram.quantile(q) for q in qs}
+            for (m, grouping, group), histogram in sorted(self.histograms.items())
+            if m == metric and grouping == by
+        }
+
+    def summary(self, by: str = "domain") -> pd.DataFrame:
+        rows = []
+        for (metric, grouping, group), histogram in sorted(self.histograms.items()):
+            if grouping != by:
+                continue
+            rows.append({
+                "metric": metric,
+                by: group,
+                "count": histogram.count,
+                "mean": histogram.mean(),
+                "p50": histogram.quantile(0.5),
+                "p90": histogram.quantile(0.9),
+                "p99": histogram.quantile(0.99)
+            })
+        return pd.DataFrame(rows)
+
+
+class RecommendationAggregator:
+    """Portfolio-wide ranking of recommended actions, updated incrementally as components are analysed
+
+    Each distinct action (rule id plus its template field values) is interned once; per
+    action only a count, a risk-weighted score and the affected component ids are kept.
+    Text is formatted only for the actions returned by top().
+    """
 
-class GenAIAnalysisModule:
     def __init__(self):
-        self.requirement_analyzer = RequirementAnalyzer()
-        self.architecture_assessor = ArchitectureAssessor()
+        self.actions = []
+        self.counts = []
+        self.weights = []
+        self.components = []
+        self._action_index = {}
+        self._contributions = {}
+
+    def _intern(self, rules: RuleTable, rule_id: str, context: Dict) -> int:
+        key = (id(rules),) + rules.action_key(rule_id, context)
+        action = self._action_index.get(key)
+        if action is None:
+            action = len(self.actions)
+            self._action_index[key] = action
+            fields = {field: context[field] for field in rules.fields[rule_id]}
+            self.actions.append((rules, rule_id, fields))
+            self.counts.append(0)
+            self.weights.append(0.0)
+            self.components.append(set())
+        return action
+
+    def add(self, component_id: Optional[str], risk_score: float,
+            rule_hits: List[Tuple[RuleTable, List[str], Dict]]):
+        """Record a component's matched rules as (rule table, rule ids, template context) triples
+
+        Adding a component id again replaces its earlier contribution.
+        """
+        if component_id is not None:
+            self.remove(component_id)
+
+        actions = [
+            self._intern(rules, rule_id, context)
+            for rules, rule_ids, context in rule_hits
+            for rule_id in rule_ids
+        ]
+        for action in actions:
+            self.counts[action] += 1
+            self.weights[action] += risk_score
+            if component_id is not None:
+                self.components[action].add(component_id)
+        if component_id is not None:
+            self._contributions[component_id] = (tuple(actions), risk_score)
+
+    def remove(self, component_id: str):
+        actions, risk_score = self._contributions.pop(component_id, ((), 0.0))
+        for action in actions:
+            self.counts[action] -= 1
+            self.weights[action] -= risk_score
+            self.components[action].discard(component_id)
+
+    def top(self, n: int = 10, by: str = "weight") -> List[Dict]:
+        """The n highest-ranked actions by total risk weight (or by "count")"""
+        scores = np.array(self.weights if by == "weight" else self.counts, dtype=np.float64)
+        order = [a for a in np.argsort(-scores, kind="stable") if self.counts[a] > 0][:n]
+
+        ranked = []
+        for action in order:
+            rules, rule_id, fields = self.actions[action]
+            ranked.append({
+                "rule_id": rule_id,
+                "action": rules.templates[rule_id].format(**fields),
+                "count": self.counts[action],
+                "weight": round(self.weights[action], 1),
+                "components": sorted(self.components[action])
+            })
+        return ranked
+
+
+def component_id(component: Dict) -> Optional[str]:
+    return component.get("id") or component.get("name") or None
+
+
+class GenAIAnalysisModule:
+    def __init__(self, entity_index: Optional[EntityIndex] = None, use_vectors: bool = False,
+                 deterministic: bool = False, seed: int = 0, aggregates: Optional[PortfolioAggregates] = None,
+                 metrics: Optional[StageMetrics] = None):
+        self.metrics = metrics if metrics is not None else METRICS
+        self.options = {"use_vectors": use_vectors, "deterministic": deterministic, "seed": seed}
+        self.requirement_analyzer = RequirementAnalyzer(cache=get_analysis_cache(), use_vectors=use_vectors)
+        self.architecture_assessor = ArchitectureAssessor(deterministic=deterministic, seed=seed)
         self.risk_assessor = RiskAssessor()
+        self.entity_index = entity_index if entity_index is not None else EntityIndex()
+        self.aggregates = aggregates if aggregates is not None else PortfolioAggregates()
+        self.recommendation_aggregator = RecommendationAggregator()
+
+    @property
+    def version(self) -> str:
+        """Hash of everything besides the component itself that analyze_component results depend on"""
+        assessor = self.architecture_assessor
+        return format(stable_hash(
+            self.requirement_analyzer.keyword_version,
+            assessor.catalog_version,
+            assessor.deterministic,
+            assessor.seed,
+            assessor.RECOMMENDATION_RULES.rules,
+            self.risk_assessor.RISK_FACTORS,
+            self.risk_assessor.MITIGATION_RULES.rules
+        ), "016x")
+
+    def analyze_component(self, component_data: Dict, tier: AnalysisTier = AnalysisTier.FULL,
+                          req_analysis: Optional[Dict] = None) -> Dict:
+        with self.metrics.time("analyze_component"):
+            result = self._assess(component_data, tier, req_analysis)
+            self._record(result, tier)
+        return result
+
+    def analyze_components(self, components: List[Dict], tier: AnalysisTier = AnalysisTier.FULL,
+                           batch_size: int = 256, record: bool = True) -> List[Dict]:
+        """Analyze several components, running requirement analysis for all descriptions in one batch
+
+        With record=False the results are not folded into the entity index and aggregates,
+        keeping memory flat when streaming an unbounded inventory.
+        """
+        results = self._assess_many(components, tier, batch_size)
+        return [self._record(result, tier) for result in results] if record else results
+
+    def analyze_portfolio(self, components: List[Dict], workers: int = 1, tier: AnalysisTier = AnalysisTier.FULL,
+                          chunk_size: int = 256) -> pd.DataFrame:
+        """Analyze a whole inventory, sharded across a process pool, returning one row per component in input order
+
+        Each worker builds its own module and loads the spaCy model once. The input dicts are
+        not modified, and this module's indexes and aggregates are updated from the results.
+        """
+        components = [dict(component) for component in components]
+        if workers <= 1:
+            return portfolio_frame(self.analyze_components(components, tier))
+
+        shards = [components[i:i + chunk_size] for i in range(0, len(components), chunk_size)]
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_portfolio_worker,
+                                 initargs=(self.options, tier)) as pool:
+            results = [result for shard in pool.map(_analyze_shard, shards, [tier] * len(shards)) for result in shard]
+        return portfolio_frame([self._record(result, tier) for result in results])
+
+    def _assess_many(self, components: List[Dict], tier: AnalysisTier, batch_size: int = 256) -> List[Dict]:
+        described = [i for i, component in enumerate(components) if component.get("description")]
+        with self.metrics.time("requirements_batch"):
+            analyses = self.requirement_analyzer.analyze_requirements_batch(
+                [components[i]["description"] for i in described], batch_size=batch_size, tier=tier
+            )
+        req_analyses = dict(zip(described, analyses))
+        return [self._assess(component, tier, req_analyses.get(i)) for i, component in enumerate(components)]
 
-    def analyze_component(self, component_data: Dict) -> Dict:
-        req_analysis = None
+    def _assess(self, component_data: Dict, tier: AnalysisTier, req_analysis: Optional[Dict] = None) -> Dict:
         if "description" in component_data and component_data["description"]:
-            req_analysis = self.requirement_analyzer.analyze_requirements(component_data["description"])
+            if req_analysis is None:
+                with self.metrics.time("requirements"):
+                    req_analysis = self.requirement_analyzer.analyze_requirements(component_data["description"], tier)
             component_data.update({
                 "domain": req_analysis["primary_domain"],
                 "layer": req_analysis["primary_layer"],
                 "entities": req_analysis["entities"]
             })
 
-        assessment = self.architecture_assessor.assess_compliance(component_data)
-        recommendations = self.architecture_assessor.generate_recommendations(assessment)
+        metrics = self.metrics
+        with metrics.time("compliance"):
+            assessment = self.architecture_assessor.assess_compliance(component_data)
+        with metrics.time("recommendations"):
+            recommendations = self.architecture_assessor.generate_recommendations(assessment)
 
-        risk_assessment = self.risk_assessor.assess_risk(component_data)
-        risk_mitigations = self.risk_assessor.generate_risk_mitigation(risk_assessment)
+        with metrics.time("risk"):
+            risk_assessment = self.risk_assessor.assess_risk(component_data)
+        with metrics.time("mitigations"):
+            risk_mitigations = self.risk_assessor.generate_risk_mitigation(risk_assessment)
 
         return {
             "component": component_data,
@@ -300,21 +1662,44 @@ class GenAIAnalysisModule:
             "recommendations": recommendations + risk_mitigations
         }
 
-    def visualize_analysis(self, analysis_result: Dict):
-        tab1, tab2, tab3 = st.tabs([
-            "Compliance Overview",
-            "Risk Analysis",
-            "Recommendations"
+    def _record(self, result: Dict, tier: AnalysisTier) -> Dict:
+        """Fold an analysis result into the entity index and portfolio aggregates"""
+        with self.metrics.time("record"):
+            return self._record_result(result, tier)
+
+    def _record_result(self, result: Dict, tier: AnalysisTier) -> Dict:
+        component_data = result["component"]
+        assessment = result["architecture_assessment"]
+        risk_assessment = result["risk_assessment"]
+
+        if result["requirement_analysis"] and tier is AnalysisTier.FULL and component_id(component_data):
+            self.entity_index.add(component_id(component_data), result["requirement_analysis"]["entities"])
+
+        self.aggregates.add(assessment, risk_assessment)
+        self.recommendation_aggregator.add(component_id(component_data), risk_assessment["total_score"], [
+            (self.architecture_assessor.RECOMMENDATION_RULES,
+             self.architecture_assessor.recommendation_ids(assessment), assessment),
+            (self.risk_assessor.MITIGATION_RULES, self.risk_assessor.mitigation_ids(risk_assessment), risk_assessment)
         ])
+        return result
 
-        with tab1:
-            self._show_compliance_charts(analysis_result)
+    def visualize_analysis(self, analysis_result: Dict):
+        metrics = self.metrics
+        with metrics.time("visualize"):
+            tab1, tab2, tab3 = st.tabs([
+                "Compliance Overview",
+                "Risk Analysis",
+                "Recommendations"
+            ])
+
+            with tab1, metrics.time("visualize_compliance"):
+                self._show_compliance_charts(analysis_result)
 
-        with tab2:
-            self._show_risk_analysis(analysis_result)
+            with tab2, metrics.time("visualize_risk"):
+                self._show_risk_analysis(analysis_result)
 
-        with tab3:
-            self._show_recommendations(analysis_result)
+            with tab3, metrics.time("visualize_recommendations"):
+                self._show_recommendations(analysis_result)
 
     def _show_compliance_charts(self, analysis_result: Dict):
         assessment = analysis_result["architecture_assessment"]
@@ -405,10 +1790,188 @@ class GenAIAnalysisModule:
                     st.markdown(f"- {action}")
 
 
+def to_jsonable(value):
+    """Convert an analysis result into plain JSON types, encoding enums by name"""
+    if isinstance(value, Enum):
+        return value.name
+    if isinstance(value, dict):
+        return {(k.name if isinstance(k, Enum) else str(k)): to_jsonable(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [to_jsonable(v) for v in value]
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+def portfolio_frame(results: List[Dict]) -> pd.DataFrame:
+    """Flatten analyze_component results into one DataFrame row per component"""
+    rows = []
+    for result in results:
+        component = result["component"]
+        assessment = result["architecture_assessment"]
+        risk_assessment = result["risk_assessment"]
+        rows.append({
+            "id": component_id(component),
+            "domain": assessment["domain"],
+            "layer": assessment["layer"],
+            "togaf_compliance": assessment["togaf_compliance"],
+            "nora_alignment": assessment["nora_alignment"],
+            "business_alignment": assessment["business_alignment"],
+            "technical_debt": assessment["technical_debt"],
+            "total_score": risk_assessment["total_score"],
+            "risk_level": risk_assessment["risk_level"],
+            "entities": component.get("entities", []),
+            "recommendations": result["recommendations"]
+        })
+    return pd.DataFrame(rows, columns=[
+        "id", "domain", "layer", "togaf_compliance", "nora_alignment", "business_alignment",
+        "technical_debt", "total_score", "risk_level", "entities", "recommendations"
+    ])
+
+
+# Per-process state of analyze_portfolio workers
+_worker_module = None
+_inherited_analysis_cache = None
+
+
+def _init_portfolio_worker(options: Dict, tier: AnalysisTier):
+    global _worker_module, _analysis_cache, _analysis_cache_lock, _inherited_analysis_cache
+    # Forked workers inherit the parent's global random state; reseed so their scores differ
+    np.random.seed()
+    # SQLite connections must not be used across fork(), so give each worker its own cache.
+    # The inherited one is kept referenced so it is never closed (or otherwise touched) here.
+    _inherited_analysis_cache = _analysis_cache
+    _analysis_cache = None
+    _analysis_cache_lock = threading.Lock()
+    _worker_module = GenAIAnalysisModule(**options)
+    if tier is AnalysisTier.FULL:
+        get_nlp()
+
+
+def _analyze_shard(components: List[Dict], tier: AnalysisTier) -> List[Dict]:
+    return _worker_module._assess_many(components, tier)
+
+
+class IncrementalAnalysis:
+    """Re-runs analyze_component only for components whose input fingerprint changed since the last run
+
+    Fingerprints and results are kept per component id, in memory or in an SQLite file so
+    that a nightly refresh only pays for the components that actually changed. A result
+    computed at one tier is not reused for the other.
+    """
+
+    FINGERPRINT_FIELDS = ["id", "name", "description", "domain", "layer"] + list(RiskAssessor.RISK_FACTORS)
+
+    def __init__(self, module: Optional[GenAIAnalysisModule] = None, path: Optional[str] = None):
+        self.module = module if module is not None else GenAIAnalysisModule(deterministic=True)
+        self.last_run = {"total": 0, "recomputed": 0, "reused": 0}
+
+        self._fingerprints = {}
+        self._results = {}
+        self._db = None
+        if path:
+            self._db = sqlite3.connect(path)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS assessments "
+                "(id TEXT PRIMARY KEY, fingerprint TEXT NOT NULL, result BLOB NOT NULL)"
+            )
+            self._db.commit()
+            self._fingerprints = dict(self._db.execute("SELECT id, fingerprint FROM assessments"))
+
+    def fingerprint(self, component: Dict, tier: AnalysisTier = AnalysisTier.FULL,
+                    version: Optional[str] = None) -> str:
+        """Hash of the component's inputs, the analysis tier and the module version
+
+        Pass version when fingerprinting many components, since computing it is not free.
+        """
+        values = []
+        for field in self.FINGERPRINT_FIELDS:
+            value = component.get(field)
+            values.append(value.name if isinstance(value, Enum) else value)
+        payload = json.dumps([version or self.module.version, tier.name, values], default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def analyze(self, components: List[Dict], tier: AnalysisTier = AnalysisTier.FULL,
+                prune: bool = False) -> List[Dict]:
+        """Return results for all components in input order, recomputing only new or changed ones"""
+        version = self.module.version
+        fingerprints = [self.fingerprint(component, tier, version) for component in components]
+        ids = [component_id(component) for component in components]
+
+        clean = [
+            i for i, (cid, fp) in enumerate(zip(ids, fingerprints))
+            if cid is not None and self._fingerprints.get(cid) == fp
+        ]
+        results = [None] * len(components)
+        for i, result in zip(clean, self._load_results([ids[i] for i in clean])):
+            results[i] = result
+
+        updates = []
+        for i, component in enumerate(components):
+            if results[i] is None:
+                results[i] = self.module.analyze_component(dict(component), tier)
+                if ids[i] is not None:
+                    updates.append((ids[i], fingerprints[i], results[i]))
+        self._store(updates)
+
+        if prune:
+            self.forget(set(self._fingerprints) - set(ids))
+
+        self.last_run = {"total": len(components), "recomputed": len(components) - len(clean), "reused": len(clean)}
+        return results
+
+    def forget(self, ids: Iterable[str]):
+        ids = list(ids)
+        for cid in ids:
+            self._fingerprints.pop(cid, None)
+            self._results.pop(cid, None)
+        if self._db is not None and ids:
+            self._db.executemany("DELETE FROM assessments WHERE id = ?", [(cid,) for cid in ids])
+            self._db.commit()
+
+    def _load_results(self, ids: List[str]) -> List[Dict]:
+        if self._db is None:
+            return [pickle.loads(self._results[cid]) for cid in ids]
+
+        loaded = {}
+        # Stay under SQLite's bound-parameter limit
+        for start in range(0, len(ids), 500):
+            chunk = ids[start:start + 500]
+            rows = self._db.execute(
+                f"SELECT id, result FROM assessments WHERE id IN ({','.join('?' * len(chunk))})", chunk
+            )
+            loaded.update((cid, pickle.loads(blob)) for cid, blob in rows)
+        return [loaded[cid] for cid in ids]
+
+    def _store(self, updates: List[Tuple[str, str, Dict]]):
+        for cid, fp, result in updates:
+            self._fingerprints[cid] = fp
+            if self._db is None:
+                # Stored pickled, like the SQLite path, so callers never share the stored copy
+                self._results[cid] = pickle.dumps(result)
+        if self._db is not None and updates:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO assessments (id, fingerprint, result) VALUES (?, ?, ?)",
+                [(cid, fp, pickle.dumps(result)) for cid, fp, result in updates]
+            )
+            self._db.commit()
+
+
+def get_analysis_module() -> GenAIAnalysisModule:
+    """Return this Streamlit session's module
+
+    The module's entity index and aggregates belong to one user, so each session gets its
+    own; construction is cheap because catalogs and compiled keyword tables are shared.
+    """
+    if "analysis_module" not in st.session_state:
+        st.session_state["analysis_module"] = GenAIAnalysisModule()
+    return st.session_state["analysis_module"]
+
+
 def show_genai_module():
     st.title("GenAI Enterprise Architecture Analysis")
 
-    analysis_module = GenAIAnalysisModule()
+    analysis_module = get_analysis_module()
 
     with st.expander("Input Architecture Component Details", expanded=True):
         col1, col2 = st.columns(2)
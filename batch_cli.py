@@ -0,0 +1,162 @@
+"""Headless batch analysis of architecture components.
+
+Reads components as JSONL or CSV from a file or stdin, streams them through
+GenAIAnalysisModule in bounded batches and writes one JSON result per line as
+each batch completes. Neither Streamlit nor matplotlib is imported, and memory
+stays flat regardless of input size. Records that cannot be read or analyzed
+are reported on stderr with their line number and skipped, and the exit
+status is then 1.
+
+    python batch_cli.py components.jsonl --output results.jsonl
+    cat components.csv | python batch_cli.py --format csv --tier fast
+"""
+import argparse
+import csv
+import json
+import sys
+from contextlib import ExitStack
+from itertools import islice
+from typing import Callable, Dict, Iterator, List, TextIO, Tuple
+
+from app2 import METRICS, AnalysisTier, GenAIAnalysisModule, normalize_component, to_jsonable
+
+
+FORMATS = ["jsonl", "csv"]
+
+
+def report_error(line_no: int, message: str):
+    print(f"line {line_no}: {message}", file=sys.stderr)
+
+
+def read_jsonl(stream: TextIO, on_error: Callable[[int, str], None] = report_error) -> Iterator[Tuple[int, Dict]]:
+    for line_no, line in enumerate(stream, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as e:
+            on_error(line_no, f"invalid JSON: {e}")
+            continue
+        if not isinstance(record, dict):
+            on_error(line_no, "expected a JSON object per line")
+            continue
+        yield line_no, record
+
+
+def read_csv(stream: TextIO, on_error: Callable[[int, str], None] = report_error) -> Iterator[Tuple[int, Dict]]:
+    reader = csv.DictReader(stream)
+    try:
+        # Read the header up front so line numbers below point at data records
+        reader.fieldnames
+    except csv.Error as e:
+        on_error(reader.line_num, f"invalid CSV header: {e}")
+        return
+    while True:
+        # Report the line a record starts on; quoted fields may span several lines
+        line_no = reader.line_num + 1
+        try:
+            row = next(reader)
+        except StopIteration:
+            return
+        except csv.Error as e:
+            # The reader has consumed the bad record, so carry on with the next one
+            on_error(line_no, f"invalid CSV: {e}")
+            continue
+        # Empty cells mean "not provided", matching a missing key in JSONL input
+        yield line_no, {k: v for k, v in row.items() if k and v not in (None, "")}
+
+
+def read_components(stream: TextIO, fmt: str,
+                    on_error: Callable[[int, str], None] = report_error) -> Iterator[Tuple[int, Dict]]:
+    """Yield (line number, component) pairs, reporting and skipping records that cannot be analyzed"""
+    records = read_csv(stream, on_error) if fmt == "csv" else read_jsonl(stream, on_error)
+    for line_no, record in records:
+        try:
+            yield line_no, normalize_component(record)
+        except ValueError as e:
+            on_error(line_no, str(e))
+
+
+def batches(records: Iterator, size: int) -> Iterator[list]:
+    while True:
+        batch = list(islice(records, size))
+        if not batch:
+            return
+        yield batch
+
+
+def _analyze_batch(module: GenAIAnalysisModule, batch: List[Tuple[int, Dict]], tier: AnalysisTier,
+                   batch_size: int, on_error: Callable[[int, str], None]) -> List[Dict]:
+    try:
+        return module.analyze_components([record for _, record in batch], tier, batch_size=batch_size, record=False)
+    except Exception:
+        pass
+
+    # Retry one at a time so a single bad record only loses itself
+    results = []
+    for line_no, record in batch:
+        try:
+            results.extend(module.analyze_components([record], tier, record=False))
+        except Exception as e:
+            on_error(line_no, f"analysis failed: {e!r}")
+    return results
+
+
+def run(module: GenAIAnalysisModule, records: Iterator[Tuple[int, Dict]], out: TextIO, tier: AnalysisTier,
+        batch_size: int, on_error: Callable[[int, str], None] = report_error) -> int:
+    """Analyze records batch by batch, writing each result as it is produced; returns the count written"""
+    count = 0
+    for batch in batches(records, batch_size):
+        for result in _analyze_batch(module, batch, tier, batch_size, on_error):
+            out.write(json.dumps(to_jsonable(result)))
+            out.write("\n")
+            count += 1
+        out.flush()
+    return count
+
+
+def _detect_format(path: str) -> str:
+    return "csv" if path.lower().endswith(".csv") else "jsonl"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Analyze architecture components without the UI")
+    parser.add_argument("input", nargs="?", default="-", help="components file, or - for stdin (default)")
+    parser.add_argument("--format", choices=FORMATS, help="input format (default: from the file extension, else jsonl)")
+    parser.add_argument("--output", default="-", help="results file, or - for stdout (default)")
+    parser.add_argument("--tier", choices=[t.name.lower() for t in AnalysisTier], default="full")
+    parser.add_argument("--batch-size", type=int, default=256)
+    parser.add_argument("--deterministic", action="store_true", help="derive scores from component content")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--metrics", help="write per-stage timings here at the end (.json for JSON, else Prometheus text)")
+    args = parser.parse_args(argv)
+    METRICS.enabled = METRICS.enabled or bool(args.metrics)
+
+    fmt = args.format or _detect_format(args.input)
+    errors = []
+
+    def on_error(line_no: int, message: str):
+        errors.append(line_no)
+        report_error(line_no, message)
+
+    module = GenAIAnalysisModule(deterministic=args.deterministic, seed=args.seed)
+    try:
+        with ExitStack() as files:
+            source = sys.stdin if args.input == "-" else files.enter_context(
+                open(args.input, encoding="utf-8", newline=""))
+            out = sys.stdout if args.output == "-" else files.enter_context(
+                open(args.output, "w", encoding="utf-8"))
+            count = run(module, read_components(source, fmt, on_error), out, AnalysisTier[args.tier.upper()],
+                        args.batch_size, on_error)
+    except (OSError, UnicodeDecodeError) as e:
+        parser.exit(1, f"error: {e}\n")
+    print(f"Analyzed {count} components, skipped {len(errors)}", file=sys.stderr)
+    if args.metrics:
+        METRICS.dump(args.metrics)
+    if errors:
+        parser.exit(1)
+
+
+if __name__ == "__main__":
+    main()
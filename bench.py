@@ -0,0 +1,214 @@
+"""Benchmarks for the RequirementAnalyzer hot path.
+
+Generates deterministic synthetic component descriptions from the analyzer's own
+domain/NORA vocabularies and measures docs/sec, p50/p95/p99 latency and peak RSS
+for the single, batch, cached and fast-path modes. Each mode runs in a fresh
+process, since ru_maxrss never goes down; peak_rss_mb is that process's peak and
+rss_growth_mb how much of it the mode's own setup and run added.
+
+    python bench.py --docs 2000 --lengths 20 200 1000 --output bench_results.json
+    python bench.py --output new_results.json --compare bench_results.json
+"""
+import argparse
+import json
+import multiprocessing
+import platform
+import random
+import resource
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Dict, List
+
+import numpy as np
+import spacy
+
+from app2 import NLP_MODEL, AnalysisCache, AnalysisTier, RequirementAnalyzer
+
+
+MODES = ["single", "batch", "cached", "fast", "fast-batch", "vector"]
+
+FILLER_WORDS = [
+    "the", "for", "with", "and", "of", "to", "across", "supports", "manages", "provides",
+    "customer", "internal", "regional", "legacy", "new", "shared", "reporting", "portal",
+    "team", "users", "requests", "records", "nightly", "real-time", "integration", "module"
+]
+
+ENTITY_PHRASES = ["SAP", "Oracle", "Microsoft Azure", "Ministry of Finance", "Riyadh", "Salesforce"]
+
+
+def generate_descriptions(count: int, length: int, seed: int = 0, keyword_ratio: float = 0.3) -> List[str]:
+    """Build count descriptions of about length words, mixing keywords, filler and named entities"""
+    rng = random.Random(seed)
+    keywords = sorted(RequirementAnalyzer().keyword_index)
+
+    descriptions = []
+    for _ in range(count):
+        words = []
+        while len(words) < length:
+            roll = rng.random()
+            if roll < keyword_ratio:
+                words.append(rng.choice(keywords))
+            elif roll < keyword_ratio + 0.02:
+                words.append(rng.choice(ENTITY_PHRASES))
+            else:
+                words.append(rng.choice(FILLER_WORDS))
+        descriptions.append(" ".join(words).capitalize() + ".")
+    return descriptions
+
+
+def peak_rss_mb() -> float:
+    # ru_maxrss is reported in kilobytes on Linux and bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _summarize(mode: str, length: int, batch_size: int, docs: int, elapsed: float,
+               latencies: List[float], baseline_rss: float) -> Dict:
+    latencies_ms = np.array(latencies) * 1000
+    p50, p95, p99 = np.percentile(latencies_ms, [50, 95, 99]) if len(latencies_ms) else (0.0, 0.0, 0.0)
+    return {
+        "mode": mode,
+        "length": length,
+        "batch_size": batch_size,
+        "docs": docs,
+        "docs_per_sec": round(docs / elapsed, 1) if elapsed else None,
+        "latency_ms": {"p50": round(float(p50), 4), "p95": round(float(p95), 4), "p99": round(float(p99), 4)},
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+        "rss_growth_mb": round(peak_rss_mb() - baseline_rss, 1)
+    }
+
+
+def _time_calls(fn, items) -> List[float]:
+    latencies = []
+    for item in items:
+        start = time.perf_counter()
+        fn(item)
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def run_mode(mode: str, texts: List[str], length: int, batch_size: int) -> Dict:
+    """Run one benchmark mode; batch modes report per-batch latency"""
+    baseline_rss = peak_rss_mb()
+    if mode == "single":
+        analyzer = RequirementAnalyzer()
+        run, items = analyzer.analyze_requirements, texts
+    elif mode == "fast":
+        analyzer = RequirementAnalyzer()
+        run, items = (lambda t: analyzer.analyze_requirements(t, AnalysisTier.FAST)), texts
+    elif mode == "vector":
+        analyzer = RequirementAnalyzer(use_vectors=True)
+        run, items = (lambda t: analyzer.analyze_requirements(t, AnalysisTier.FAST)), texts
+    elif mode == "cached":
+        analyzer = RequirementAnalyzer(cache=AnalysisCache(path=None, max_entries=len(texts)))
+        analyzer.analyze_requirements_batch(texts)
+        run, items = analyzer.analyze_requirements, texts
+    elif mode in ("batch", "fast-batch"):
+        analyzer = RequirementAnalyzer()
+        tier = AnalysisTier.FAST if mode == "fast-batch" else AnalysisTier.FULL
+        run = lambda batch: analyzer.analyze_requirements_batch(batch, batch_size=batch_size, tier=tier)
+        items = [texts[i:i + batch_size] for i in range(0, len(texts), batch_size)]
+    else:
+        raise ValueError(f"Unknown benchmark mode: {mode}")
+
+    # Warm up model loading and compiled tables outside the timed region
+    run(items[0])
+
+    start = time.perf_counter()
+    latencies = _time_calls(run, items)
+    elapsed = time.perf_counter() - start
+    return _summarize(mode, length, batch_size if mode in ("batch", "fast-batch") else 1,
+                      len(texts), elapsed, latencies, baseline_rss)
+
+
+def run_mode_isolated(mode: str, texts: List[str], length: int, batch_size: int) -> Dict:
+    """run_mode in a freshly spawned process, so its memory figures are its own"""
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+        return pool.submit(run_mode, mode, texts, length, batch_size).result()
+
+
+def run_benchmarks(modes: List[str], docs: int, lengths: List[int], batch_sizes: List[int],
+                   seed: int = 0) -> Dict:
+    results = []
+    for length in lengths:
+        texts = generate_descriptions(docs, length, seed=seed)
+        for mode in modes:
+            for batch_size in (batch_sizes if mode in ("batch", "fast-batch") else [1]):
+                result = run_mode_isolated(mode, texts, length, batch_size)
+                results.append(result)
+                print(_format_result(result), flush=True)
+
+    return {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "numpy": np.__version__,
+            "spacy": spacy.__version__,
+            "model": NLP_MODEL,
+            "keyword_version": RequirementAnalyzer().keyword_version,
+            "docs": docs,
+            "seed": seed
+        },
+        "results": results
+    }
+
+
+def _format_result(result: Dict) -> str:
+    latency = result["latency_ms"]
+    return (
+        f"{result['mode']:<11} len={result['length']:<5} batch={result['batch_size']:<5} "
+        f"{result['docs_per_sec']:>10} docs/s  p50={latency['p50']:.3f}ms  p95={latency['p95']:.3f}ms  "
+        f"p99={latency['p99']:.3f}ms  rss={result['peak_rss_mb']}MB (+{result['rss_growth_mb']}MB)"
+    )
+
+
+def compare(current: Dict, baseline: Dict) -> List[str]:
+    """Report docs/sec change against a previous results file, matching on mode/length/batch size"""
+    key = lambda r: (r["mode"], r["length"], r["batch_size"])
+    previous = {key(r): r for r in baseline["results"]}
+
+    lines = []
+    for result in current["results"]:
+        before = previous.get(key(result))
+        if before is None or not before["docs_per_sec"]:
+            continue
+        change = (result["docs_per_sec"] - before["docs_per_sec"]) / before["docs_per_sec"] * 100
+        lines.append(
+            f"{result['mode']:<11} len={result['length']:<5} batch={result['batch_size']:<5} "
+            f"{before['docs_per_sec']:>10} -> {result['docs_per_sec']:>10} docs/s ({change:+.1f}%)"
+        )
+    return lines
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark RequirementAnalyzer")
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=MODES)
+    parser.add_argument("--docs", type=int, default=1000)
+    parser.add_argument("--lengths", nargs="+", type=int, default=[20, 200, 1000])
+    parser.add_argument("--batch-sizes", nargs="+", type=int, default=[64, 256])
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default="bench_results.json")
+    parser.add_argument("--compare", help="previous results file to compare against")
+    args = parser.parse_args(argv)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+
+    report = run_benchmarks(args.modes, args.docs, args.lengths, args.batch_sizes, seed=args.seed)
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {args.output}")
+
+    if baseline is not None:
+        print("\n".join(compare(report, baseline)))
+
+
+if __name__ == "__main__":
+    main()